@@ -1,68 +1,287 @@
-from typing import Dict, List, Any, Optional
+import sys
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, List, Any, Optional, Sequence, Tuple
+import numpy as np
 import sql_compiler as sc
+from predicate import ARITHMETIC_OPS, CompiledPredicate, ConstantOperand, Operand, PredicateKernel, compile_kernel, compile_operand, compile_predicate, compile_row_function
 
 class ColumnDef:
     def __init__(self, name: str, data_type: sc.TokenType):
         self.name = name
         self.type = data_type
 
+# Storage dtype per column type; TEXT and DATE values stay Python strings
+_COLUMN_DTYPES: Dict[sc.TokenType, Any] = {
+    sc.TokenType.INT: np.int64,
+    sc.TokenType.FLOAT: np.float64,
+    sc.TokenType.TEXT: object,
+    sc.TokenType.DATE: object,
+}
+
+# Python value types each column type accepts; NULL (None) is accepted by every column
+_ACCEPTED_TYPES = {
+    sc.TokenType.INT: (int,),
+    sc.TokenType.FLOAT: (int, float),
+    sc.TokenType.TEXT: (str,),
+    sc.TokenType.DATE: (str,),
+}
+
+_INITIAL_CAPACITY = 8
+
+# Below this many rows a compiled predicate is applied row by row, since
+# NumPy's per-call overhead outweighs the vectorized scan
+_VECTORIZE_MIN_ROWS = 32
+# Above this many rows numeric predicates run as a fused numba kernel when available
+_KERNEL_MIN_ROWS = 100000
+# A WHERE clause applied row by row is turned into generated Python source once
+# it has been executed this many times
+_CODEGEN_MIN_USES = 2
+_PLAN_CACHE_SIZE = 256
+
+# Enum members bound once at import so expression evaluation does plain global lookups
+_IDENTIFIER = sc.NodeType.IDENTIFIER
+_LITERAL = sc.NodeType.LITERAL
+_EXPRESSION = sc.NodeType.EXPRESSION
+_DOT = sc.TokenType.DOT
+
+def _type_mismatch(column: ColumnDef, value_type: type) -> str:
+    return f"Type mismatch for column '{column.name}'. Expected {column.type}, got {value_type}"
+
+def _out_of_range(column: ColumnDef) -> str:
+    return f"Value out of range for column '{column.name}'"
+
+def validate_value(value: Any, column: ColumnDef) -> Optional[str]:
+    # Why value cannot be stored in column, or None if it can. The range check is
+    # the conversion to the column's dtype, as in column_array
+    if value is None:
+        return None
+    if not isinstance(value, _ACCEPTED_TYPES[column.type]):
+        return _type_mismatch(column, type(value))
+    dtype = _COLUMN_DTYPES[column.type]
+    if dtype is not object:
+        try:
+            dtype(value)
+        except OverflowError:
+            return _out_of_range(column)
+    return None
+
+def column_array(column: ColumnDef, values: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    # Storage array and NULL mask for new values of a column, checked one distinct
+    # type and one dtype conversion at a time. Raises ValueError as validate_value reports
+    accepted = _ACCEPTED_TYPES[column.type]
+    for value_type in set(map(type, values)):
+        if value_type is not type(None) and not issubclass(value_type, accepted):
+            raise ValueError(_type_mismatch(column, value_type))
+    data = np.array(values, dtype=object)
+    nulls = data == None  # elementwise, unlike "is None"
+    dtype = _COLUMN_DTYPES[column.type]
+    if dtype is not object:
+        data[nulls] = 0
+        try:
+            data = data.astype(dtype)
+        except OverflowError:
+            raise ValueError(_out_of_range(column))
+    return data, nulls
+
 class Table:
     def __init__(self, name: str, columns: List[ColumnDef], title: Optional[str] = None):
         self.name = name
         self.title = title if title else name
         self.columns = columns
-        self.rows = []
+        # Lower-cased column name -> index; the first of any same-named columns wins
+        self._col_index: Dict[str, int] = {}
+        for i, col in enumerate(columns):
+            self._col_index.setdefault(col.name.lower(), i)
+        # Columnar storage: one typed array per column plus a NULL bitmap,
+        # over-allocated to a power-of-two capacity and valid up to self.length
+        self.length = 0
+        self.capacity = _INITIAL_CAPACITY
+        self._col_dtype = [_COLUMN_DTYPES[col.type] for col in columns]
+        self.columns_data: List[np.ndarray] = [np.zeros(self.capacity, dtype=dtype) for dtype in self._col_dtype]
+        self.null_masks: List[np.ndarray] = [np.zeros(self.capacity, dtype=bool) for col in columns]
+        # Title, header and separator lines keyed by the printed column indices
+        self._header_cache: Dict[Tuple[int, ...], str] = {}
         
     def add_row(self, values: List[Any]) -> bool:
         if len(values) != len(self.columns):
             print(f"Error: Column count mismatch. Expected {len(self.columns)}, got {len(values)}")
             return False
+        for value, col in zip(values, self.columns):
+            error = validate_value(value, col)
+            if error is not None:
+                print(f"Error: {error}")
+                return False
+        if self.length == self.capacity:
+            self._grow(self.length + 1)
         for i, value in enumerate(values):
-            if not self._validate_type(value, self.columns[i].type):
-                print(f"Error: Type mismatch for column '{self.columns[i].name}'. Expected {self.columns[i].type}, got {type(value)}")
+            self.set_value(i, self.length, value)
+        self.length += 1
+        return True
+    
+    def add_rows(self, rows: List[List[Any]]) -> bool:
+        # Bulk insert: type-check and convert one whole column at a time instead of value by value
+        for values in rows:
+            if len(values) != len(self.columns):
+                print(f"Error: Column count mismatch. Expected {len(self.columns)}, got {len(values)}")
                 return False
-        self.rows.append(values)
+        if not rows:
+            return True
+        new_data = []
+        new_nulls = []
+        for col, column_values in zip(self.columns, zip(*rows)):
+            try:
+                data, nulls = column_array(col, column_values)
+            except ValueError as e:
+                print(f"Error: {e}")
+                return False
+            new_data.append(data)
+            new_nulls.append(nulls)
+        end = self.length + len(rows)
+        if end > self.capacity:
+            self._grow(end)
+        for i in range(len(self.columns)):
+            self.columns_data[i][self.length:end] = new_data[i]
+            self.null_masks[i][self.length:end] = new_nulls[i]
+        self.length = end
         return True
     
-    def _validate_type(self, value: Any, expected_type: sc.TokenType) -> bool:
+    def _grow(self, min_capacity: int) -> None:
+        capacity = max(self.capacity, 1)
+        while capacity < min_capacity:
+            capacity *= 2
+        for i in range(len(self.columns)):
+            data = np.zeros(capacity, dtype=self.columns_data[i].dtype)
+            data[:self.length] = self.columns_data[i][:self.length]
+            self.columns_data[i] = data
+            nulls = np.zeros(capacity, dtype=bool)
+            nulls[:self.length] = self.null_masks[i][:self.length]
+            self.null_masks[i] = nulls
+        self.capacity = capacity
+    
+    def fill(self, col_idx: int, mask: np.ndarray, value: Any) -> None:
+        # Set one value in every row selected by mask
+        data = self.column_values(col_idx)
         if value is None:
-            return True
-        if expected_type == sc.TokenType.INT:
-            return isinstance(value, int)
-        elif expected_type == sc.TokenType.FLOAT:
-            return isinstance(value, (int, float))
-        elif expected_type == sc.TokenType.TEXT:
-            return isinstance(value, str)
-        elif expected_type == sc.TokenType.DATE:
-            return isinstance(value, str)
-        return False
+            data[mask] = None if data.dtype == object else 0
+        else:
+            data[mask] = value
+        self.column_nulls(col_idx)[mask] = value is None
+    
+    def set_values(self, col_idx: int, row_indices: np.ndarray, data: np.ndarray, nulls: np.ndarray) -> None:
+        # Set row row_indices[k] to data[k], NULL where nulls[k]; see column_array
+        self.column_values(col_idx)[row_indices] = data
+        self.column_nulls(col_idx)[row_indices] = nulls
+    
+    def set_value(self, col_idx: int, row_idx: int, value: Any) -> None:
+        data = self.columns_data[col_idx]
+        if value is None:
+            data[row_idx] = None if data.dtype == object else 0
+            self.null_masks[col_idx][row_idx] = True
+        else:
+            data[row_idx] = value
+            self.null_masks[col_idx][row_idx] = False
+    
+    def column_values(self, col_idx: int) -> np.ndarray:
+        return self.columns_data[col_idx][:self.length]
+    
+    def column_nulls(self, col_idx: int) -> np.ndarray:
+        return self.null_masks[col_idx][:self.length]
+    
+    def column_list(self, col_idx: int) -> List[Any]:
+        # Python values for one column, with NULLs as None
+        values = self.column_values(col_idx).tolist()
+        for row_idx in np.flatnonzero(self.column_nulls(col_idx)):
+            values[row_idx] = None
+        return values
+    
+    def iter_rows(self) -> Iterator[Tuple[Any, ...]]:
+        # Rows as tuples of Python values, with NULLs as None
+        return zip(*(self.column_list(i) for i in range(len(self.columns))))
+    
+    def subset(self, mask: np.ndarray) -> 'Table':
+        # New table sharing this table's schema with only the rows selected by mask
+        table = Table(self.name, self.columns, title=self.title)
+        table.columns_data = [self.column_values(i)[mask] for i in range(len(self.columns))]
+        table.null_masks = [self.column_nulls(i)[mask] for i in range(len(self.columns))]
+        table.length = int(np.count_nonzero(mask))
+        table.capacity = table.length
+        table._header_cache = self._header_cache
+        return table
+    
+    def compress(self, keep: np.ndarray) -> None:
+        for i in range(len(self.columns)):
+            self.columns_data[i] = self.column_values(i)[keep]
+            self.null_masks[i] = self.column_nulls(i)[keep]
+        self.length = int(np.count_nonzero(keep))
+        self.capacity = self.length
     
     def get_column_index(self, column_name: str) -> int:
-        for i, col in enumerate(self.columns):
-            if col.name.lower() == column_name.lower():
-                return i
-        return -1
+        return self._col_index.get(column_name.lower(), -1)
     
     def print_table(self, columns: Optional[List[int]] = None) -> None:
-        print(f"\nTable: {self.title}\n")
-        if not columns:
-            columns = list(range(len(self.columns)))
-        header = [self.columns[i].name for i in columns]
-        print(" | ".join(header))
-        print("-" * (sum(len(h) for h in header) + 3 * (len(header) - 1)))
-        for row in self.rows:
-            row_data = ["NULL" if row[i] is None else str(row[i]) for i in columns]
-            print(" | ".join(row_data))
+        key = tuple(columns) if columns else tuple(range(len(self.columns)))
+        heading = self._header_cache.get(key)
+        if heading is None:
+            header = [self.columns[i].name for i in key]
+            separator = "-" * (sum(len(h) for h in header) + 3 * (len(header) - 1))
+            heading = self._header_cache[key] = f"\nTable: {self.title}\n\n{' | '.join(header)}\n{separator}"
+        # Stringify column by column, then emit the whole table with a single write
+        cells = [["NULL" if value is None else str(value) for value in self.column_list(i)] for i in key]
+        lines = [heading]
+        lines.extend(map(" | ".join, zip(*cells)))
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+class CompiledWhere:
+    __slots__ = ('predicate', 'kernel', 'kernel_built', 'row_function', 'uses')
+
+    def __init__(self, predicate: CompiledPredicate):
+        self.predicate = predicate
+        # numba kernel, built on the first scan of a table large enough to use one
+        self.kernel: Optional[PredicateKernel] = None
+        self.kernel_built = False
+        self.row_function: Optional[Callable[[Sequence[Any]], bool]] = None
+        self.uses = 0
+
+# Everything a SELECT/INSERT/UPDATE/DELETE needs resolved before it touches data:
+# the target table, column indices and the compiled WHERE clause
+class ExecutionPlan:
+    __slots__ = ('stmt_kind', 'table', 'selected_columns', 'count_column', 'count_label',
+                 'insert_columns', 'set_clauses', 'compiled_where')
+
+    def __init__(self, stmt_kind: sc.NodeType, table: Table):
+        self.stmt_kind = stmt_kind
+        self.table = table
+        self.selected_columns: List[int] = []
+        # COUNT(...) queries: -1 counts every selected row, otherwise the non-NULL values of that column
+        self.count_column: Optional[int] = None
+        self.count_label = ""
+        self.insert_columns: Optional[List[int]] = None
+        self.set_clauses: List[Tuple[int, Operand]] = []
+        self.compiled_where: Optional[CompiledWhere] = None
+
+def ast_key(node: Any) -> Any:
+    # Hashable structural key for an AST, so equal statements parsed separately share a plan
+    if isinstance(node, sc.ASTNode):
+        return (node.type,) + tuple(ast_key(getattr(node, field)) for field in node.FIELDS)
+    if isinstance(node, list):
+        return tuple(ast_key(item) for item in node)
+    return node
 
 class Database:
-    def __init__(self):
+    def __init__(self) -> None:
         self.tables: Dict[str, Table] = {}
+        # Execution plans keyed by ast_key(), least recently used first
+        self._plan_cache: OrderedDict = OrderedDict()
+        # Bumped on every table create/drop so prepared statements know to rebind their plan
+        self._schema_version = 0
     
     def create_table(self, name: str, columns: List[ColumnDef], title: Optional[str] = None) -> bool:
         if name.lower() in self.tables:
             print(f"Error: Table '{name}' already exists")
             return False
         self.tables[name.lower()] = Table(name, columns, title)
+        self._schema_changed()
         return True
     
     def drop_table(self, name: str) -> bool:
@@ -70,8 +289,14 @@ class Database:
             print(f"Error: Table '{name}' does not exist")
             return False
         del self.tables[name.lower()]
+        self._schema_changed()
         return True
     
+    def _schema_changed(self) -> None:
+        # Plans hold resolved tables, so any schema change invalidates them
+        self._plan_cache.clear()
+        self._schema_version += 1
+    
     def get_table(self, name: str) -> Optional[Table]:
         return self.tables.get(name.lower())
     
@@ -92,171 +317,319 @@ class Database:
             print(f"Error: Unsupported query type: {ast.type}")
             return False
 
-    def _execute_select(self, ast: sc.ASTNode) -> bool:
-        if not ast.data.get('tables', []):
-            print("Error: No table specified in SELECT statement")
-            return False
-        table_node = ast.data['tables'][0]  # Accessing first table in list
-        table_name = table_node.data['name']
+    def prepare(self, ast: sc.ASTNode) -> Optional[Callable[[], bool]]:
+        # Bind a statement to its execution plan once; calling the result runs the
+        # statement without the plan cache lookup. Returns None if no plan can be built
+        run = _PLAN_RUNNERS.get(ast.type)
+        if run is None:
+            # CREATE/DROP have no plan
+            return lambda: self.execute_query(ast)
+        first_plan = self._get_plan(ast)
+        if first_plan is None:
+            return None
+        plan: ExecutionPlan = first_plan
+        version = self._schema_version
+
+        def execute() -> bool:
+            nonlocal plan, version
+            if version != self._schema_version:
+                # The plan's table may have been dropped or recreated since
+                rebound = self._get_plan(ast)
+                if rebound is None:
+                    return False
+                plan, version = rebound, self._schema_version
+            return run(self, plan, ast)
+        return execute
+
+    def _get_plan(self, ast: sc.ASTNode) -> Optional[ExecutionPlan]:
+        key = ast_key(ast)
+        plan = self._plan_cache.get(key)
+        if plan is not None:
+            self._plan_cache.move_to_end(key)
+            return plan
+        plan = self._build_plan(ast)
+        if plan is not None:
+            self._plan_cache[key] = plan
+            if len(self._plan_cache) > _PLAN_CACHE_SIZE:
+                self._plan_cache.popitem(last=False)
+        return plan
+
+    def _build_plan(self, ast: sc.ASTNode) -> Optional[ExecutionPlan]:
+        if ast.type == sc.NodeType.SELECT_STMT:
+            if not ast.tables:
+                print("Error: No table specified in SELECT statement")
+                return None
+            table_name = ast.tables[0].name  # Accessing first table in list
+        else:
+            table_name = ast.table.name
         table = self.get_table(table_name)
         if not table:
             print(f"Error: Table '{table_name}' not found")
-            return False
-        selected_columns = []
-        if ast.data['columns'][0].data['name'] == '*':
-            selected_columns = list(range(len(table.columns)))
-        else:
-            for col_node in ast.data['columns']:
-                col_name = col_node.data['name']
+            return None
+        plan = ExecutionPlan(ast.type, table)
+        if ast.type == sc.NodeType.SELECT_STMT:
+            columns = ast.columns
+            if len(columns) == 1 and columns[0].type == sc.NodeType.FUNCTION_CALL:
+                call = columns[0]
+                args = call.args
+                if call.name.lower() != 'count' or len(args) != 1 or args[0].type != sc.NodeType.IDENTIFIER:
+                    print(f"Error: Unsupported function: {call.name}")
+                    return None
+                arg = args[0].name
+                plan.count_column = -1 if arg == '*' else table.get_column_index(arg)
+                if plan.count_column == -1 and arg != '*':
+                    print(f"Error: Column '{arg}' not found in table '{table_name}'")
+                    return None
+                plan.count_label = f"{call.name}({arg})"
+            elif columns[0].name == '*':
+                plan.selected_columns = list(range(len(table.columns)))
+            else:
+                for col_node in columns:
+                    if col_node.type != sc.NodeType.IDENTIFIER:
+                        print(f"Error: Unsupported column expression: {col_node.type}")
+                        return None
+                    col_name = col_node.name
+                    col_idx = table.get_column_index(col_name)
+                    if col_idx == -1:
+                        print(f"Error: Column '{col_name}' not found in table '{table_name}'")
+                        return None
+                    plan.selected_columns.append(col_idx)
+        elif ast.type == sc.NodeType.INSERT_STMT:
+            if ast.columns:
+                plan.insert_columns = []
+                for col_node in ast.columns:
+                    col_name = col_node.name
+                    col_idx = table.get_column_index(col_name)
+                    if col_idx == -1:
+                        print(f"Error: Column '{col_name}' not found in table '{table_name}'")
+                        return None
+                    plan.insert_columns.append(col_idx)
+            return plan
+        elif ast.type == sc.NodeType.UPDATE_STMT:
+            for set_node in ast.set_clauses:
+                col_name = set_node.left.name
                 col_idx = table.get_column_index(col_name)
                 if col_idx == -1:
                     print(f"Error: Column '{col_name}' not found in table '{table_name}'")
-                    return False
-                selected_columns.append(col_idx)
-        filtered_rows = []
-        for row in table.rows:
-            if not ast.data.get('where_clause') or self._evaluate_condition(ast.data['where_clause'], table, row):
-                filtered_rows.append(row)
-        temp_table = Table(table.name, table.columns, title=table.title)
-        temp_table.rows = filtered_rows
-        temp_table.print_table(selected_columns)
-        print(f"\n{len(filtered_rows)} row(s) selected")
+                    return None
+                # Compiled like WHERE operands; expressions over columns are evaluated per row
+                try:
+                    operand = compile_operand(set_node.right, table)
+                except ValueError as e:
+                    print(f"Error: {e}")
+                    return None
+                if isinstance(operand, ConstantOperand):
+                    error = validate_value(operand.value, table.columns[col_idx])
+                    if error is not None:
+                        print(f"Error: {error}")
+                        return None
+                plan.set_clauses.append((col_idx, operand))
+        if ast.where_clause:
+            try:
+                predicate = compile_predicate(ast.where_clause, table)
+            except ValueError as e:
+                print(f"Error: {e}")
+                return None
+            plan.compiled_where = CompiledWhere(predicate)
+        return plan
+
+    def _execute_select(self, ast: sc.ASTNode) -> bool:
+        plan = self._get_plan(ast)
+        if plan is None:
+            return False
+        return self._run_select(plan, ast)
+
+    def _run_select(self, plan: ExecutionPlan, ast: sc.ASTNode) -> bool:
+        table = plan.table
+        mask = self._evaluate_where(plan)
+        if plan.count_column is not None:
+            count = self._count_selected(plan, mask)
+            print(f"\nTable: {table.title}\n")
+            print(plan.count_label)
+            print("-" * len(plan.count_label))
+            print(count)
+            print("\n1 row(s) selected")
+            return True
+        temp_table = table.subset(mask)
+        temp_table.print_table(plan.selected_columns)
+        print(f"\n{temp_table.length} row(s) selected")
         return True
 
+    def _count_selected(self, plan: ExecutionPlan, mask: np.ndarray) -> int:
+        # COUNT(*) or COUNT(column), straight off the selection bitmap without materializing any rows
+        column = plan.count_column
+        if column is None or column == -1:
+            return int(np.count_nonzero(mask))
+        return int(np.count_nonzero(mask & ~plan.table.column_nulls(column)))
+
+    def select_rows(self, ast: sc.ASTNode) -> Optional[Tuple[List[str], List[List[Any]]]]:
+        # Run a SELECT and return (column names, rows) instead of printing them.
+        # The WHERE clause is evaluated as a column mask and only matching rows are materialized
+        plan = self._get_plan(ast)
+        if plan is None:
+            return None
+        table = plan.table
+        mask = self._evaluate_where(plan)
+        if plan.count_column is not None:
+            return [plan.count_label], [[self._count_selected(plan, mask)]]
+        temp_table = table.subset(mask)
+        columns = [table.columns[i].name for i in plan.selected_columns]
+        rows = [list(row) for row in zip(*(temp_table.column_list(i) for i in plan.selected_columns))]
+        return columns, rows
+
     def _execute_insert(self, ast: sc.ASTNode) -> bool:
-        table_name = ast.data['table'].data['name']
-        table = self.get_table(table_name)
-        if not table:
-            print(f"Error: Table '{table_name}' not found")
+        plan = self._get_plan(ast)
+        if plan is None:
             return False
-        if ast.data['columns']:
-            column_indices = []
-            for col_node in ast.data['columns']:
-                col_name = col_node.data['name']
-                col_idx = table.get_column_index(col_name)
-                if col_idx == -1:
-                    print(f"Error: Column '{col_name}' not found in table '{table_name}'")
-                    return False
-                column_indices.append(col_idx)
-            values = [None] * len(table.columns)
-            for i, col_idx in enumerate(column_indices):
-                if i < len(ast.data['values']):
-                    values[col_idx] = self._evaluate_expression(ast.data['values'][i])
-            if not table.add_row(values):
+        return self._run_insert(plan, ast)
+
+    def _run_insert(self, plan: ExecutionPlan, ast: sc.ASTNode) -> bool:
+        table = plan.table
+        rows = []
+        if plan.insert_columns is not None:
+            for row_exprs in ast.rows:
+                values = [None] * len(table.columns)
+                for i, col_idx in enumerate(plan.insert_columns):
+                    if i < len(row_exprs):
+                        values[col_idx] = self._evaluate_expression(row_exprs[i])
+                rows.append(values)
+        else:
+            for row_exprs in ast.rows:
+                rows.append([self._evaluate_expression(expr) for expr in row_exprs])
+        if len(rows) == 1:
+            if not table.add_row(rows[0]):
                 return False
+            print("1 row inserted")
         else:
-            values = [self._evaluate_expression(expr) for expr in ast.data['values']]
-            if not table.add_row(values):
+            if not table.add_rows(rows):
                 return False
-        print("1 row inserted")
+            print(f"{len(rows)} rows inserted")
         return True
 
     def _execute_update(self, ast: sc.ASTNode) -> bool:
-        table_name = ast.data['table'].data['name']
-        table = self.get_table(table_name)
-        if not table:
-            print(f"Error: Table '{table_name}' not found")
+        plan = self._get_plan(ast)
+        if plan is None:
             return False
-        set_clauses = []
-        for set_node in ast.data['set_clauses']:
-            col_name = set_node.data['left'].data['name']
-            col_idx = table.get_column_index(col_name)
-            if col_idx == -1:
-                print(f"Error: Column '{col_name}' not found in table '{table_name}'")
+        return self._run_update(plan, ast)
+
+    def _run_update(self, plan: ExecutionPlan, ast: sc.ASTNode) -> bool:
+        table = plan.table
+        mask = self._evaluate_where(plan)
+        row_indices = np.flatnonzero(mask)
+        if not len(row_indices):
+            print("0 row(s) updated")
+            return True
+        # Every SET expression is evaluated over the matching rows as they were before
+        # the update, and all results are converted before anything is written
+        new_values: List[Optional[Tuple[np.ndarray, np.ndarray]]] = []
+        matching = None
+        for col_idx, operand in plan.set_clauses:
+            if isinstance(operand, ConstantOperand):
+                new_values.append(None)
+                continue
+            if matching is None:
+                matching = table.subset(mask)
+            values, nulls = operand.values(matching)
+            items = np.broadcast_to(values, (matching.length,)).tolist()
+            for row_idx in np.flatnonzero(np.broadcast_to(nulls, (matching.length,))):
+                items[row_idx] = None
+            try:
+                new_values.append(column_array(table.columns[col_idx], items))
+            except ValueError as e:
+                print(f"Error: {e}")
                 return False
-            value = self._evaluate_expression(set_node.data['right'])
-            set_clauses.append((col_idx, value))
-        rows_updated = 0
-        for row in table.rows:
-            if not ast.data.get('where_clause') or self._evaluate_condition(ast.data['where_clause'], table, row):
-                for col_idx, value in set_clauses:
-                    row[col_idx] = value
-                rows_updated += 1
-        print(f"{rows_updated} row(s) updated")
+        # One masked assignment per SET column
+        for (col_idx, operand), converted in zip(plan.set_clauses, new_values):
+            if isinstance(operand, ConstantOperand):
+                table.fill(col_idx, mask, operand.value)
+            elif converted is not None:
+                table.set_values(col_idx, row_indices, *converted)
+        print(f"{len(row_indices)} row(s) updated")
         return True
 
     def _execute_delete(self, ast: sc.ASTNode) -> bool:
-        table_name = ast.data['table'].data['name']
-        table = self.get_table(table_name)
-        if not table:
-            print(f"Error: Table '{table_name}' not found")
+        plan = self._get_plan(ast)
+        if plan is None:
             return False
-        rows_to_keep = []
-        rows_deleted = 0
-        for row in table.rows:
-            if ast.data.get('where_clause') and not self._evaluate_condition(ast.data['where_clause'], table, row):
-                rows_to_keep.append(row)
-            else:
-                rows_deleted += 1
-        table.rows = rows_to_keep
+        return self._run_delete(plan, ast)
+
+    def _run_delete(self, plan: ExecutionPlan, ast: sc.ASTNode) -> bool:
+        mask = self._evaluate_where(plan)
+        rows_deleted = int(np.count_nonzero(mask))
+        if rows_deleted:
+            plan.table.compress(~mask)
         print(f"{rows_deleted} row(s) deleted")
         return True
 
     def _execute_create(self, ast: sc.ASTNode) -> bool:
-        table_name = ast.data['table'].data['name']
+        table_name = ast.table.name
         columns = []
-        for col_node in ast.data['columns']:
-            col_name = col_node.data['name']
-            col_type = col_node.data['data_type']
+        for col_node in ast.columns:
+            col_name = col_node.name.name
+            col_type = col_node.data_type
             columns.append(ColumnDef(col_name, col_type))
-        title = ast.data.get('title')
+        title = ast.title
         if self.create_table(table_name, columns, title=title):
             print(f"Table '{table_name}' created")
             return True
         return False
 
     def _execute_drop(self, ast: sc.ASTNode) -> bool:
-        table_name = ast.data['table'].data['name']
+        table_name = ast.table.name
         if self.drop_table(table_name):
             print(f"Table '{table_name}' dropped")
             return True
         return False
 
-    def _evaluate_condition(self, condition: sc.ASTNode, table: Table, row: List[Any]) -> bool:
-        if condition.type == sc.NodeType.CONDITION:
-            if 'operator' in condition.data and condition.data['operator'] == sc.TokenType.AND:
-                return (self._evaluate_condition(condition.data['left'], table, row) and 
-                        self._evaluate_condition(condition.data['right'], table, row))
-            elif 'operator' in condition.data and condition.data['operator'] == sc.TokenType.OR:
-                return (self._evaluate_condition(condition.data['left'], table, row) or 
-                        self._evaluate_condition(condition.data['right'], table, row))
-            elif 'operator' in condition.data and condition.data['operator'] == sc.TokenType.NOT:
-                return not self._evaluate_condition(condition.data['right'], table, row)
-            elif 'operator' in condition.data:
-                left_value = self._evaluate_expression(condition.data['left'], table, row)
-                right_value = self._evaluate_expression(condition.data['right'], table, row)
-                op = condition.data['operator']
-                if op == sc.TokenType.EQUALS: return left_value == right_value
-                if op == sc.TokenType.NOT_EQUALS: return left_value != right_value
-                if op == sc.TokenType.GREATER: return left_value > right_value
-                if op == sc.TokenType.LESS: return left_value < right_value
-                if op == sc.TokenType.GREATER_EQUALS: return left_value >= right_value
-                if op == sc.TokenType.LESS_EQUALS: return left_value <= right_value
-                print(f"Error: Unsupported operator: {op}")
-                return False
-        return bool(self._evaluate_expression(condition, table, row))
+    def _evaluate_where(self, plan: ExecutionPlan) -> np.ndarray:
+        # Selection bitmap over the table's rows; no WHERE selects every row
+        table = plan.table
+        compiled = plan.compiled_where
+        if compiled is None:
+            return np.ones(table.length, dtype=bool)
+        compiled.uses += 1
+        if table.length < _VECTORIZE_MIN_ROWS:
+            if compiled.row_function is None and compiled.uses >= _CODEGEN_MIN_USES:
+                compiled.row_function = compile_row_function(compiled.predicate)
+            row_function = compiled.row_function or compiled.predicate.eval
+            return np.fromiter(map(row_function, table.iter_rows()), dtype=bool, count=table.length)
+        if table.length >= _KERNEL_MIN_ROWS:
+            if not compiled.kernel_built:
+                compiled.kernel = compile_kernel(compiled.predicate, table)
+                compiled.kernel_built = True
+            if compiled.kernel is not None:
+                return compiled.kernel.mask(table)
+        return compiled.predicate.mask(table)
 
     def _evaluate_expression(self, expr: sc.ASTNode, table: Optional[Table] = None, row: Optional[List[Any]] = None) -> Any:
-        if expr.type == sc.NodeType.IDENTIFIER:
+        expr_type = expr.type
+        if expr_type is _IDENTIFIER:
             if table and row:
-                col_idx = table.get_column_index(expr.data['name'])
+                col_idx = table.get_column_index(expr.name)
                 if col_idx != -1:
                     return row[col_idx]
-            return expr.data['name']
-        elif expr.type == sc.NodeType.LITERAL:
-            return expr.data['value']
-        elif expr.type == sc.NodeType.EXPRESSION:
-            left_value = self._evaluate_expression(expr.data['left'], table, row)
-            if expr.data['operator'] == sc.TokenType.DOT:
-                return left_value + "." + self._evaluate_expression(expr.data['right'], table, row)
-            right_value = self._evaluate_expression(expr.data['right'], table, row)
-            op = expr.data['operator']
-            if op == sc.TokenType.PLUS: return left_value + right_value
-            if op == sc.TokenType.MINUS: return left_value - right_value
-            if op == sc.TokenType.ASTERISK: return left_value * right_value
-            if op == sc.TokenType.DIVIDE: return left_value / right_value
+            return expr.name
+        elif expr_type is _LITERAL:
+            return expr.value
+        elif expr_type is _EXPRESSION:
+            left_value = self._evaluate_expression(expr.left, table, row)
+            op = expr.operator
+            if op == _DOT:
+                return left_value + "." + self._evaluate_expression(expr.right, table, row)
+            right_value = self._evaluate_expression(expr.right, table, row)
+            op_fn = ARITHMETIC_OPS.get(op)
+            if op_fn is not None:
+                return op_fn(left_value, right_value)
             print(f"Error: Unsupported operator: {op}")
             return None
         else:
             print(f"Error: Unsupported expression type: {expr.type}")
             return None
+
+# Statement runners for prepared statements, by statement type
+_PLAN_RUNNERS = {
+    sc.NodeType.SELECT_STMT: Database._run_select,
+    sc.NodeType.INSERT_STMT: Database._run_insert,
+    sc.NodeType.UPDATE_STMT: Database._run_update,
+    sc.NodeType.DELETE_STMT: Database._run_delete,
+}
@@ -0,0 +1,535 @@
+import operator
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import sql_compiler as sc
+
+try:
+    import numba  # type: ignore[import-not-found]
+except ImportError:
+    numba = None  # type: ignore[assignment]
+
+COMPARISON_OPS = {
+    sc.TokenType.EQUALS: operator.eq,
+    sc.TokenType.NOT_EQUALS: operator.ne,
+    sc.TokenType.GREATER: operator.gt,
+    sc.TokenType.LESS: operator.lt,
+    sc.TokenType.GREATER_EQUALS: operator.ge,
+    sc.TokenType.LESS_EQUALS: operator.le,
+}
+
+ARITHMETIC_OPS = {
+    sc.TokenType.PLUS: operator.add,
+    sc.TokenType.MINUS: operator.sub,
+    sc.TokenType.ASTERISK: operator.mul,
+    sc.TokenType.DIVIDE: operator.truediv,
+}
+
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+# Integer arithmetic whose float64 estimate reaches this magnitude may not fit
+# in int64 and is redone with Python ints. Well below 2 ** 63 so the estimate's
+# rounding error cannot hide an overflow
+_INT64_SAFE = 2.0 ** 62
+
+def _is_numeric(value: Any) -> bool:
+    # Int/float columns and constants NumPy can hold without overflow
+    if isinstance(value, np.ndarray):
+        return value.dtype != object
+    if isinstance(value, int):
+        return _INT64_MIN <= value <= _INT64_MAX
+    return isinstance(value, float)
+
+def _is_integer(value: Any) -> bool:
+    if isinstance(value, np.ndarray):
+        return value.dtype.kind in 'biu'
+    return isinstance(value, int)
+
+def _take(value: Any, mask: np.ndarray) -> Any:
+    return value[mask] if isinstance(value, np.ndarray) and value.ndim else value
+
+def _objects(value: Any) -> Any:
+    # Python values for a numeric array, so arithmetic and comparisons are exact
+    return value.astype(object) if isinstance(value, np.ndarray) and value.dtype != object else value
+
+# Operands evaluate either against one row (a sequence of values, None for NULL)
+# or against a whole table, returning (values, nulls) where values is a column
+# array or a scalar and nulls is the matching NULL mask
+class Operand:
+    __slots__ = ()
+
+    def eval(self, row: Sequence[Any]) -> Any:
+        raise NotImplementedError
+
+    def values(self, table) -> Tuple[Any, Any]:
+        raise NotImplementedError
+
+class ColumnOperand(Operand):
+    __slots__ = ('col_idx',)
+
+    def __init__(self, col_idx: int):
+        self.col_idx = col_idx
+
+    def eval(self, row: Sequence[Any]) -> Any:
+        return row[self.col_idx]
+
+    def values(self, table) -> Tuple[Any, Any]:
+        return table.column_values(self.col_idx), table.column_nulls(self.col_idx)
+
+class ConstantOperand(Operand):
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def eval(self, row: Sequence[Any]) -> Any:
+        return self.value
+
+    def values(self, table) -> Tuple[Any, Any]:
+        return self.value, np.bool_(self.value is None)
+
+class ArithmeticOperand(Operand):
+    __slots__ = ('op', 'op_fn', 'left', 'right')
+
+    def __init__(self, op: sc.TokenType, left: Operand, right: Operand):
+        self.op = op
+        self.op_fn = ARITHMETIC_OPS[op]
+        self.left = left
+        self.right = right
+
+    def eval(self, row: Sequence[Any]) -> Any:
+        left = self.left.eval(row)
+        right = self.right.eval(row)
+        if left is None or right is None:
+            return None
+        # Division by zero yields NULL rather than raising
+        if self.op == sc.TokenType.DIVIDE and right == 0:
+            return None
+        return self.op_fn(left, right)
+
+    def values(self, table) -> Tuple[Any, Any]:
+        left, left_nulls = self.left.values(table)
+        right, right_nulls = self.right.values(table)
+        nulls = left_nulls | right_nulls
+        if self.op == sc.TokenType.DIVIDE:
+            nulls = nulls | (right == 0)
+        if not isinstance(left, np.ndarray) and not isinstance(right, np.ndarray):
+            return (None if nulls else self.op_fn(left, right)), nulls
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            if _is_numeric(left) and _is_numeric(right) and not self._overflows(left, right):
+                return self.op_fn(left, right), nulls
+            valid = ~np.broadcast_to(nulls, (table.length,))
+            values = np.empty(table.length, dtype=object)
+            values[valid] = self.op_fn(_objects(_take(left, valid)), _objects(_take(right, valid)))
+            return values, nulls
+
+    def _overflows(self, left: Any, right: Any) -> bool:
+        # Whether int64 arithmetic on these operands could wrap around
+        if self.op == sc.TokenType.DIVIDE or not (_is_integer(left) and _is_integer(right)):
+            return False
+        estimate = self.op_fn(np.asarray(left, dtype=np.float64), np.asarray(right, dtype=np.float64))
+        return bool(np.any(np.abs(estimate) >= _INT64_SAFE))
+
+# A WHERE clause compiled against one table: column names are resolved to
+# indices and literals to Python values once, so evaluation never touches the AST
+class CompiledPredicate:
+    __slots__ = ()
+
+    def eval(self, row: Sequence[Any]) -> bool:
+        raise NotImplementedError
+
+    def mask(self, table) -> np.ndarray:
+        raise NotImplementedError
+
+class ComparisonPredicate(CompiledPredicate):
+    __slots__ = ('op', 'op_fn', 'left', 'right')
+
+    def __init__(self, op: sc.TokenType, left: Operand, right: Operand):
+        self.op = op
+        self.op_fn = COMPARISON_OPS[op]
+        self.left = left
+        self.right = right
+
+    def eval(self, row: Sequence[Any]) -> bool:
+        left = self.left.eval(row)
+        right = self.right.eval(row)
+        if left is None or right is None:
+            return False
+        return self.op_fn(left, right)
+
+    def mask(self, table) -> np.ndarray:
+        left, left_nulls = self.left.values(table)
+        right, right_nulls = self.right.values(table)
+        valid = ~np.broadcast_to(left_nulls | right_nulls, (table.length,))
+        with np.errstate(invalid='ignore'):
+            if _is_numeric(left) and _is_numeric(right):
+                # Numeric columns hold 0 in NULL slots, so compare everything and mask afterwards
+                return np.broadcast_to(self.op_fn(left, right), (table.length,)) & valid
+            # Object columns hold None in NULL slots, which cannot be ordered; compare only valid rows
+            result = np.zeros(table.length, dtype=bool)
+            result[valid] = self.op_fn(_objects(_take(left, valid)), _objects(_take(right, valid)))
+            return result
+
+class ColumnComparisonPredicate(ComparisonPredicate):
+    # column <op> constant, the most common WHERE leaf, evaluated per row in a single
+    # frame instead of one eval() call per operand
+    __slots__ = ('col_idx', 'value')
+
+    def __init__(self, op: sc.TokenType, left: ColumnOperand, right: ConstantOperand):
+        super().__init__(op, left, right)
+        self.col_idx = left.col_idx
+        self.value = right.value
+
+    def eval(self, row: Sequence[Any]) -> bool:
+        value = row[self.col_idx]
+        return value is not None and self.op_fn(value, self.value)
+
+class AndPredicate(CompiledPredicate):
+    __slots__ = ('children',)
+
+    def __init__(self, children: List[CompiledPredicate]):
+        self.children = children
+
+    def eval(self, row: Sequence[Any]) -> bool:
+        for child in self.children:
+            if not child.eval(row):
+                return False
+        return True
+
+    def mask(self, table) -> np.ndarray:
+        result = self.children[0].mask(table)
+        for i in range(1, len(self.children)):
+            selected = np.count_nonzero(result)
+            if not selected:
+                break
+            if selected * _PUSHDOWN_RATIO <= table.length:
+                # Few rows left: run the remaining children over those rows only
+                rows = np.flatnonzero(result)
+                survivors = _RowSubset(table, rows)
+                keep = np.ones(len(rows), dtype=bool)
+                for child in self.children[i:]:
+                    keep &= child.mask(survivors)
+                    if not keep.any():
+                        break
+                result = np.zeros(table.length, dtype=bool)
+                result[rows[keep]] = True
+                return result
+            result &= self.children[i].mask(table)
+        return result
+
+# An AND switches to evaluating its remaining children on the surviving rows
+# once no more than 1 in this many rows is still selected
+_PUSHDOWN_RATIO = 8
+
+class _RowSubset:
+    # The given rows of a table, with the interface predicates evaluate against.
+    # Columns are gathered on first use, so only the columns a child reads are copied
+    __slots__ = ('table', 'rows', 'name', 'length', '_values', '_nulls')
+
+    def __init__(self, table, rows: np.ndarray):
+        self.table = table
+        self.rows = rows
+        self.name = table.name
+        self.length = len(rows)
+        self._values: Dict[int, np.ndarray] = {}
+        self._nulls: Dict[int, np.ndarray] = {}
+
+    def column_values(self, col_idx: int) -> np.ndarray:
+        values = self._values.get(col_idx)
+        if values is None:
+            values = self._values[col_idx] = self.table.column_values(col_idx)[self.rows]
+        return values
+
+    def column_nulls(self, col_idx: int) -> np.ndarray:
+        nulls = self._nulls.get(col_idx)
+        if nulls is None:
+            nulls = self._nulls[col_idx] = self.table.column_nulls(col_idx)[self.rows]
+        return nulls
+
+class OrPredicate(CompiledPredicate):
+    __slots__ = ('children',)
+
+    def __init__(self, children: List[CompiledPredicate]):
+        self.children = children
+
+    def eval(self, row: Sequence[Any]) -> bool:
+        for child in self.children:
+            if child.eval(row):
+                return True
+        return False
+
+    def mask(self, table) -> np.ndarray:
+        result = self.children[0].mask(table)
+        for child in self.children[1:]:
+            if result.all():
+                break
+            result |= child.mask(table)
+        return result
+
+class TruthPredicate(CompiledPredicate):
+    __slots__ = ('operand',)
+
+    def __init__(self, operand: Operand):
+        self.operand = operand
+
+    def eval(self, row: Sequence[Any]) -> bool:
+        value = self.operand.eval(row)
+        return value is not None and bool(value)
+
+    def mask(self, table) -> np.ndarray:
+        values, nulls = self.operand.values(table)
+        return np.broadcast_to(np.asarray(values).astype(bool) & ~nulls, (table.length,)).copy()
+
+# Static cost/selectivity ranks used to order AND/OR children so short-circuiting
+# skips as much work as possible: AND runs its most selective comparisons first
+# (equality before ranges before inequality), OR runs the likeliest-true first
+_AND_RANKS = {
+    sc.TokenType.EQUALS: 0,
+    sc.TokenType.GREATER: 2,
+    sc.TokenType.LESS: 2,
+    sc.TokenType.GREATER_EQUALS: 2,
+    sc.TokenType.LESS_EQUALS: 2,
+    sc.TokenType.NOT_EQUALS: 4,
+}
+_OR_RANKS = {
+    sc.TokenType.NOT_EQUALS: 0,
+    sc.TokenType.GREATER: 2,
+    sc.TokenType.LESS: 2,
+    sc.TokenType.GREATER_EQUALS: 2,
+    sc.TokenType.LESS_EQUALS: 2,
+    sc.TokenType.EQUALS: 4,
+}
+_COMPOUND_RANK = 6
+
+def _rank(predicate: CompiledPredicate, ranks: dict) -> int:
+    if not isinstance(predicate, ComparisonPredicate):
+        return _COMPOUND_RANK
+    rank = ranks[predicate.op]
+    # Arithmetic operands cost more to evaluate than plain columns and constants
+    if isinstance(predicate.left, ArithmeticOperand) or isinstance(predicate.right, ArithmeticOperand):
+        rank += 1
+    return rank
+
+def _and_rank(predicate: CompiledPredicate) -> int:
+    return _rank(predicate, _AND_RANKS)
+
+def _or_rank(predicate: CompiledPredicate) -> int:
+    return _rank(predicate, _OR_RANKS)
+
+def _flatten(node: sc.ASTNode, op: sc.TokenType) -> List[sc.ASTNode]:
+    # Collect the operands of a chain of the same AND/OR operator
+    if node.type == sc.NodeType.CONDITION and node.operator == op:
+        return _flatten(node.left, op) + _flatten(node.right, op)
+    return [node]
+
+def compile_predicate(node: sc.ASTNode, table) -> CompiledPredicate:
+    if node.type == sc.NodeType.CONDITION and node.operator is not None:
+        op = node.operator
+        if op == sc.TokenType.AND:
+            children = [compile_predicate(child, table) for child in _flatten(node, op)]
+            return AndPredicate(sorted(children, key=_and_rank))
+        if op == sc.TokenType.OR:
+            children = [compile_predicate(child, table) for child in _flatten(node, op)]
+            return OrPredicate(sorted(children, key=_or_rank))
+        if op not in COMPARISON_OPS:
+            raise ValueError(f"Unsupported operator: {op}")
+        left = compile_operand(node.left, table)
+        right = compile_operand(node.right, table)
+        if isinstance(left, ConstantOperand) and isinstance(right, ConstantOperand):
+            return _fold(ComparisonPredicate(op, left, right))
+        if isinstance(left, ColumnOperand) and isinstance(right, ConstantOperand) and right.value is not None:
+            return ColumnComparisonPredicate(op, left, right)
+        return ComparisonPredicate(op, left, right)
+    return TruthPredicate(compile_operand(node, table))
+
+def _fold(node: Any) -> Any:
+    # Evaluate a node whose operands are all constants once, at compile time.
+    # Anything that fails (e.g. 'a' - 1) is left as is so it fails the same way at run time
+    try:
+        value = node.eval([])
+    except (TypeError, ValueError, OverflowError):
+        return node
+    if isinstance(node, CompiledPredicate):
+        return TruthPredicate(ConstantOperand(value))
+    return ConstantOperand(value)
+
+def compile_operand(node: sc.ASTNode, table) -> Operand:
+    if node.type == sc.NodeType.IDENTIFIER:
+        col_idx = table.get_column_index(node.name)
+        if col_idx != -1:
+            return ColumnOperand(col_idx)
+        return ConstantOperand(node.name)
+    elif node.type == sc.NodeType.LITERAL:
+        return ConstantOperand(node.value)
+    elif node.type == sc.NodeType.EXPRESSION:
+        op = node.operator
+        if op == sc.TokenType.DOT:
+            # table.column resolves to the column when it names this table
+            qualifier = node.left.name or ''
+            if qualifier.lower() == table.name.lower():
+                return compile_operand(node.right, table)
+            return ConstantOperand(f"{qualifier}.{node.right.name or ''}")
+        if op not in ARITHMETIC_OPS:
+            raise ValueError(f"Unsupported operator: {op}")
+        operand = ArithmeticOperand(op, compile_operand(node.left, table), compile_operand(node.right, table))
+        if isinstance(operand.left, ConstantOperand) and isinstance(operand.right, ConstantOperand):
+            return _fold(operand)
+        return operand
+    else:
+        raise ValueError(f"Unsupported expression type: {node.type}")
+
+# Fused native kernels for predicates over numeric columns (requires numba).
+# A predicate is lowered to one Python expression evaluated per row inside a
+# prange loop, so the whole WHERE clause runs as a single parallel pass with no
+# temporary arrays. Kernels take columns and constants as arguments and are
+# cached by source text, so queries differing only in literal values share one kernel
+_OP_SYMBOLS = {
+    sc.TokenType.EQUALS: "==",
+    sc.TokenType.NOT_EQUALS: "!=",
+    sc.TokenType.GREATER: ">",
+    sc.TokenType.LESS: "<",
+    sc.TokenType.GREATER_EQUALS: ">=",
+    sc.TokenType.LESS_EQUALS: "<=",
+    sc.TokenType.PLUS: "+",
+    sc.TokenType.MINUS: "-",
+    sc.TokenType.ASTERISK: "*",
+    sc.TokenType.DIVIDE: "/",
+}
+
+_KERNEL_CACHE: Dict[str, Callable] = {}
+
+class PredicateKernel:
+    __slots__ = ('fn', 'col_indices', 'constants')
+
+    def __init__(self, fn: Callable, col_indices: List[int], constants: List[Any]):
+        self.fn = fn
+        self.col_indices = col_indices
+        self.constants = constants
+
+    def mask(self, table) -> np.ndarray:
+        args = []
+        for col_idx in self.col_indices:
+            args.append(table.column_values(col_idx))
+            args.append(table.column_nulls(col_idx))
+        out = np.empty(table.length, dtype=np.bool_)
+        self.fn(*args, *self.constants, out)
+        return out
+
+def _emit_operand(operand: Operand, table, col_indices: List[int], constants: List[Any]) -> Optional[Tuple[str, str, bool]]:
+    # Returns (value expression, NULL expression, whether the value is a float),
+    # or None if the operand is not numeric
+    if isinstance(operand, ColumnOperand):
+        dtype = table.columns_data[operand.col_idx].dtype
+        if dtype == object:
+            return None
+        if operand.col_idx not in col_indices:
+            col_indices.append(operand.col_idx)
+        k = col_indices.index(operand.col_idx)
+        return f"c{k}[i]", f"n{k}[i]", dtype.kind == 'f'
+    if isinstance(operand, ConstantOperand):
+        if operand.value is None:
+            return "0", "True", False
+        if isinstance(operand.value, bool) or not isinstance(operand.value, (int, float)):
+            return None
+        # Kernel arguments are int64; larger ints are left to the NumPy path
+        if isinstance(operand.value, int) and not _INT64_MIN <= operand.value <= _INT64_MAX:
+            return None
+        constants.append(operand.value)
+        return f"k{len(constants) - 1}", "False", isinstance(operand.value, float)
+    # Division is left to the NumPy path, which turns division by zero into NULL
+    if isinstance(operand, ArithmeticOperand) and operand.op != sc.TokenType.DIVIDE:
+        left = _emit_operand(operand.left, table, col_indices, constants)
+        right = _emit_operand(operand.right, table, col_indices, constants)
+        if left is None or right is None:
+            return None
+        # int64 arithmetic would wrap on overflow; the NumPy path checks for it
+        if not (left[2] or right[2]):
+            return None
+        return f"({left[0]} {_OP_SYMBOLS[operand.op]} {right[0]})", f"({left[1]} or {right[1]})", True
+    return None
+
+def _emit_predicate(predicate: CompiledPredicate, table, col_indices: List[int], constants: List[Any]) -> Optional[str]:
+    if isinstance(predicate, ComparisonPredicate):
+        left = _emit_operand(predicate.left, table, col_indices, constants)
+        right = _emit_operand(predicate.right, table, col_indices, constants)
+        if left is None or right is None:
+            return None
+        return f"(not ({left[1]} or {right[1]}) and {left[0]} {_OP_SYMBOLS[predicate.op]} {right[0]})"
+    if isinstance(predicate, (AndPredicate, OrPredicate)):
+        parts = []
+        for child in predicate.children:
+            part = _emit_predicate(child, table, col_indices, constants)
+            if part is None:
+                return None
+            parts.append(part)
+        joiner = " and " if isinstance(predicate, AndPredicate) else " or "
+        return "(" + joiner.join(parts) + ")"
+    return None
+
+def compile_kernel(predicate: CompiledPredicate, table) -> Optional[PredicateKernel]:
+    if numba is None:
+        return None
+    col_indices: List[int] = []
+    constants: List[Any] = []
+    expr = _emit_predicate(predicate, table, col_indices, constants)
+    if expr is None:
+        return None
+    params = [f"c{k}, n{k}" for k in range(len(col_indices))] + [f"k{j}" for j in range(len(constants))]
+    source = (f"def _kernel({', '.join(params + ['out'])}):\n"
+              f"    for i in numba.prange(out.shape[0]):\n"
+              f"        out[i] = {expr}\n")
+    fn = _KERNEL_CACHE.get(source)
+    if fn is None:
+        namespace: Dict[str, Any] = {'numba': numba}
+        exec(source, namespace)
+        fn = numba.njit(parallel=True)(namespace['_kernel'])
+        _KERNEL_CACHE[source] = fn
+    return PredicateKernel(fn, col_indices, constants)
+
+# Row predicates generated as Python source: the compiled predicate tree is
+# flattened into one straight-line boolean expression over row[i] lookups,
+# so each row costs a single call instead of a recursive eval() walk. Column
+# references are guarded with "is not None" so NULL comparisons stay false,
+# and constants are bound as default arguments
+def _emit_row_operand(operand: Operand, constants: List[Any], guards: List[str]) -> str:
+    if isinstance(operand, ColumnOperand):
+        expr = f"row[{operand.col_idx}]"
+        guards.append(f"{expr} is not None")
+        return expr
+    if isinstance(operand, ConstantOperand):
+        if operand.value is None:
+            guards.append("False")
+            return "None"
+        constants.append(operand.value)
+        return f"k{len(constants) - 1}"
+    if isinstance(operand, ArithmeticOperand):
+        left = _emit_row_operand(operand.left, constants, guards)
+        right = _emit_row_operand(operand.right, constants, guards)
+        if operand.op == sc.TokenType.DIVIDE:
+            guards.append(f"{right} != 0")
+        return f"({left} {_OP_SYMBOLS[operand.op]} {right})"
+    raise ValueError(f"Unsupported operand: {type(operand).__name__}")
+
+def _emit_row_predicate(predicate: CompiledPredicate, constants: List[Any]) -> str:
+    if isinstance(predicate, ComparisonPredicate):
+        guards: List[str] = []
+        left = _emit_row_operand(predicate.left, constants, guards)
+        right = _emit_row_operand(predicate.right, constants, guards)
+        terms = list(dict.fromkeys(guards)) + [f"{left} {_OP_SYMBOLS[predicate.op]} {right}"]
+        return "(" + " and ".join(terms) + ")"
+    if isinstance(predicate, (AndPredicate, OrPredicate)):
+        joiner = " and " if isinstance(predicate, AndPredicate) else " or "
+        return "(" + joiner.join(_emit_row_predicate(child, constants) for child in predicate.children) + ")"
+    if isinstance(predicate, TruthPredicate):
+        guards = []
+        value = _emit_row_operand(predicate.operand, constants, guards)
+        return "(" + " and ".join(list(dict.fromkeys(guards)) + [f"bool({value})"]) + ")"
+    raise ValueError(f"Unsupported predicate: {type(predicate).__name__}")
+
+def compile_row_function(predicate: CompiledPredicate) -> Callable[[Sequence[Any]], bool]:
+    constants: List[Any] = []
+    expr = _emit_row_predicate(predicate, constants)
+    params = "".join(f", k{j}=k{j}" for j in range(len(constants)))
+    source = f"def _predicate(row{params}):\n    return {expr}\n"
+    namespace = {f"k{j}": value for j, value in enumerate(constants)}
+    exec(source, namespace)
+    return namespace['_predicate']
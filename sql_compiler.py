@@ -1,10 +1,13 @@
 import re
 import sys
-from enum import Enum, auto
-from typing import Dict, List, Optional, Union, Any, Tuple
+from bisect import bisect_left
+from enum import Enum, IntEnum, auto
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Optional, Union, Any, Tuple
 
-# Token types
-class TokenType(Enum):
+# Token types. An IntEnum, so the parser's many type comparisons are plain integer
+# compares; members still print as TokenType.NAME in tokens and error messages
+class TokenType(IntEnum):
     # Keywords
     SELECT = auto()
     FROM = auto()
@@ -55,14 +58,16 @@ class TokenType(Enum):
     STRING = auto()
     EOF = auto()
     ERROR = auto()
+    
+    def __str__(self) -> str:
+        return f"TokenType.{self.name}"
 
 # Token structure
-class Token:
-    def __init__(self, type: TokenType, lexeme: str, line: int, column: int):
-        self.type = type
-        self.lexeme = lexeme
-        self.line = line
-        self.column = column
+class Token(NamedTuple):
+    type: TokenType
+    lexeme: str
+    line: int
+    column: int
     
     def __str__(self):
         return f"Token({self.type}, '{self.lexeme}', line={self.line}, col={self.column})"
@@ -84,256 +89,312 @@ class NodeType(Enum):
     COLUMN_DEF = auto()
     LITERAL = auto()
     IDENTIFIER = auto()
+    FUNCTION_CALL = auto()
+
+# Initial value of the node fields a node type does not use
+_UNUSED: Any = None
 
 # AST node structure
+# One slotted class covers every node type; fields a node type does not use stay None.
+#   statements:  table, tables, columns, joins, where_clause, rows, set_clauses, title
+#   expressions: left, operator, right (CONDITION, EXPRESSION), name (IDENTIFIER, FUNCTION_CALL, COLUMN_DEF),
+#                args (FUNCTION_CALL), value and value_type (LITERAL), data_type (COLUMN_DEF), condition (JOIN)
 class ASTNode:
+    FIELDS = ('name', 'value', 'value_type', 'left', 'operator', 'right', 'args',
+              'columns', 'tables', 'joins', 'where_clause', 'condition', 'table', 'rows',
+              'set_clauses', 'data_type', 'title')
+    # sql caches SQLGenerator.generate_sql() output; ASTs are not modified after parsing
+    __slots__ = ('type',) + FIELDS + ('sql',)
+    
     def __init__(self, type: NodeType):
         self.type = type
-        self.data = {}
+        self.name: Any = None
+        self.value: Any = None
+        # Fields are typed as they are on the node types that use them; the rest
+        # start out as _UNUSED (None). joins, where_clause and title are optional clauses
+        self.value_type: TokenType = _UNUSED
+        self.left: 'ASTNode' = _UNUSED
+        self.operator: TokenType = _UNUSED
+        self.right: 'ASTNode' = _UNUSED
+        self.args: List['ASTNode'] = _UNUSED
+        self.columns: List['ASTNode'] = _UNUSED
+        self.tables: List['ASTNode'] = _UNUSED
+        self.joins: Optional[List['ASTNode']] = None
+        self.where_clause: Optional['ASTNode'] = None
+        self.condition: 'ASTNode' = _UNUSED
+        self.table: 'ASTNode' = _UNUSED
+        self.rows: List[List['ASTNode']] = _UNUSED
+        self.set_clauses: List['ASTNode'] = _UNUSED
+        self.data_type: TokenType = _UNUSED
+        self.title: Optional[str] = None
+        self.sql: Optional[str] = None
+    
+    def fields(self) -> Dict[str, Any]:
+        # The fields this node sets, by name
+        return {field: getattr(self, field) for field in self.FIELDS if getattr(self, field) is not None}
     
     def __str__(self):
-        return f"ASTNode({self.type}, {self.data})"
+        return f"ASTNode({self.type}, {self.fields()})"
+
+# Keyword lookup, lower- and upper-case spellings so the usual forms need no case folding
+_KEYWORDS = {
+    'select': TokenType.SELECT,
+    'from': TokenType.FROM,
+    'where': TokenType.WHERE,
+    'insert': TokenType.INSERT,
+    'into': TokenType.INTO,
+    'values': TokenType.VALUES,
+    'update': TokenType.UPDATE,
+    'set': TokenType.SET,
+    'delete': TokenType.DELETE,
+    'create': TokenType.CREATE,
+    'table': TokenType.TABLE,
+    'drop': TokenType.DROP,
+    'join': TokenType.JOIN,
+    'on': TokenType.ON,
+    'and': TokenType.AND,
+    'or': TokenType.OR,
+    'not': TokenType.NOT,
+    'null': TokenType.NULL,
+    'int': TokenType.INT,
+    'text': TokenType.TEXT,
+    'float': TokenType.FLOAT,
+    'date': TokenType.DATE
+}
+_KEYWORDS.update({keyword.upper(): token_type for keyword, token_type in list(_KEYWORDS.items())})
 
 # Lexer class
 class Lexer:
     def __init__(self, input_text: str):
-        self.input = input_text
-        self.position = 0
-        self.line = 1
-        self.column = 1
-        self.keywords = {
-            'select': TokenType.SELECT,
-            'from': TokenType.FROM,
-            'where': TokenType.WHERE,
-            'insert': TokenType.INSERT,
-            'into': TokenType.INTO,
-            'values': TokenType.VALUES,
-            'update': TokenType.UPDATE,
-            'set': TokenType.SET,
-            'delete': TokenType.DELETE,
-            'create': TokenType.CREATE,
-            'table': TokenType.TABLE,
-            'drop': TokenType.DROP,
-            'join': TokenType.JOIN,
-            'on': TokenType.ON,
-            'and': TokenType.AND,
-            'or': TokenType.OR,
-            'not': TokenType.NOT,
-            'null': TokenType.NULL,
-            'int': TokenType.INT,
-            'text': TokenType.TEXT,
-            'float': TokenType.FLOAT,
-            'date': TokenType.DATE
-        }
-    
-    def peek(self) -> str:
-        if self.position >= len(self.input):
-            return '\0'
-        return self.input[self.position]
-    
-    def advance(self) -> str:
-        char = self.peek()
-        self.position += 1
-        if char == '\n':
-            self.line += 1
-            self.column = 1
+        self.reset(input_text)
+    
+    def reset(self, input_text: str) -> None:
+        # Start over on new input, so one lexer can be reused across queries
+        self.input: str = input_text
+        self.position: int = 0
+        self.line: int = 1
+        self.column: int = 1
+    
+    def _consume(self, end: int) -> None:
+        # Move to `end`, updating line/column from the newlines in the consumed span
+        newlines = self.input.count('\n', self.position, end)
+        if newlines:
+            self.line += newlines
+            self.column = end - self.input.rfind('\n', self.position, end)
         else:
-            self.column += 1
-        return char
+            self.column += end - self.position
+        self.position = end
     
-    def skip_whitespace(self):
-        while self.peek().isspace():
-            self.advance()
+    def _classify(self, kind: Optional[str], start: int, end: int) -> Tuple[TokenType, str]:
+        # Token type and lexeme for the match input[start:end].
+        # Each lexeme is a single slice of the input, quotes excluded for strings
+        text = self.input
+        # Branches ordered by how common each token class is in SQL text
+        if kind == 'identifier':
+            lexeme = text[start:end]
+            token_type = _KEYWORDS.get(lexeme)
+            if token_type is None:
+                token_type = TokenType.IDENTIFIER if lexeme.islower() else _KEYWORDS.get(lexeme.lower(), TokenType.IDENTIFIER)
+        elif kind == 'operator':
+            lexeme = text[start:end]
+            token_type = _OPERATOR_TOKENS[lexeme]
+        elif kind == 'number':
+            lexeme = text[start:end]
+            token_type = TokenType.FLOAT_LITERAL if '.' in lexeme else TokenType.INTEGER
+        elif kind == 'string':
+            lexeme = text[start + 1:end - 1]
+            token_type = TokenType.STRING
+        elif kind == 'unterminated':
+            lexeme = text[start + 1:end]
+            token_type = TokenType.ERROR
+        else:
+            lexeme = text[start:end]
+            token_type = TokenType.ERROR
+        return token_type, lexeme
     
-    def skip_comment(self):
-        if self.peek() == '#':
-            while self.peek() != '\n' and self.peek() != '\0':
-                self.advance()
+    def _token(self, kind: Optional[str], start: int, end: int) -> Token:
+        # Build the token for the match input[start:end] and move past it
+        start_column = self.column
+        self._consume(end)
+        token_type, lexeme = self._classify(kind, start, end)
+        return Token(token_type, lexeme, self.line, start_column)
     
     def get_next_token(self) -> Token:
-        self.skip_whitespace()
-        self.skip_comment()
+        match = _TOKEN_PATTERN.match(self.input, self.position)
+        # Skip whitespace and comments
+        if match and match.lastgroup == 'trivia':
+            self._consume(match.end())
+            match = _TOKEN_PATTERN.match(self.input, self.position)
         
         # Check for EOF
-        if self.position >= len(self.input):
+        if not match:
             return Token(TokenType.EOF, "", self.line, self.column)
-        
-        char = self.peek()
-        
-        # Identifiers and keywords
-        if char.isalpha() or char == '_':
-            return self.identifier()
-        
-        # Numbers
-        if char.isdigit():
-            return self.number()
-        
-        # Strings
-        if char == "'" or char == '"':
-            return self.string()
-        
-        # Operators and punctuation
-        if char == '=':
-            self.advance()
-            return Token(TokenType.EQUALS, "=", self.line, self.column - 1)
-        
-        if char == '>':
-            self.advance()
-            if self.peek() == '=':
-                self.advance()
-                return Token(TokenType.GREATER_EQUALS, ">=", self.line, self.column - 2)
-            return Token(TokenType.GREATER, ">", self.line, self.column - 1)
-        
-        if char == '<':
-            self.advance()
-            if self.peek() == '=':
-                self.advance()
-                return Token(TokenType.LESS_EQUALS, "<=", self.line, self.column - 2)
-            return Token(TokenType.LESS, "<", self.line, self.column - 1)
-        
-        if char == '!':
-            self.advance()
-            if self.peek() == '=':
-                self.advance()
-                return Token(TokenType.NOT_EQUALS, "!=", self.line, self.column - 2)
-            return Token(TokenType.ERROR, "!", self.line, self.column - 1)
-        
-        if char == '+':
-            self.advance()
-            return Token(TokenType.PLUS, "+", self.line, self.column - 1)
-        
-        if char == '-':
-            self.advance()
-            return Token(TokenType.MINUS, "-", self.line, self.column - 1)
-        
-        if char == '*':
-            self.advance()
-            return Token(TokenType.ASTERISK, "*", self.line, self.column - 1)
-        
-        if char == '/':
-            self.advance()
-            return Token(TokenType.DIVIDE, "/", self.line, self.column - 1)
-        
-        if char == ',':
-            self.advance()
-            return Token(TokenType.COMMA, ",", self.line, self.column - 1)
-        
-        if char == ';':
-            self.advance()
-            return Token(TokenType.SEMICOLON, ";", self.line, self.column - 1)
-        
-        if char == '(':
-            self.advance()
-            return Token(TokenType.LEFT_PAREN, "(", self.line, self.column - 1)
-        
-        if char == ')':
-            self.advance()
-            return Token(TokenType.RIGHT_PAREN, ")", self.line, self.column - 1)
-        
-        if char == '.':
-            self.advance()
-            return Token(TokenType.DOT, ".", self.line, self.column - 1)
-        
-        # Unrecognized character
-        self.advance()
-        return Token(TokenType.ERROR, char, self.line, self.column - 1)
-    
-    def identifier(self) -> Token:
-        start_column = self.column
-        lexeme = ""
-        
-        while self.peek().isalnum() or self.peek() == '_':
-            lexeme += self.advance()
-        
-        # Check if it's a keyword
-        token_type = self.keywords.get(lexeme.lower(), TokenType.IDENTIFIER)
-        
-        return Token(token_type, lexeme, self.line, start_column)
-    
-    def number(self) -> Token:
-        start_column = self.column
-        lexeme = ""
-        is_float = False
-        
-        while self.peek().isdigit() or self.peek() == '.':
-            if self.peek() == '.':
-                if is_float:  # Second decimal point is invalid
-                    break
-                is_float = True
-            lexeme += self.advance()
-        
-        if is_float:
-            return Token(TokenType.FLOAT_LITERAL, lexeme, self.line, start_column)
-        else:
-            return Token(TokenType.INTEGER, lexeme, self.line, start_column)
+        return self._token(match.lastgroup, match.start(), match.end())
     
-    def string(self) -> Token:
-        start_column = self.column
-        quote = self.advance()  # Get the opening quote
-        lexeme = ""
-        
-        while self.peek() != quote and self.peek() != '\0':
-            lexeme += self.advance()
-        
-        if self.peek() == '\0':
-            return Token(TokenType.ERROR, lexeme, self.line, start_column)
-        
-        self.advance()  # Consume the closing quote
-        return Token(TokenType.STRING, lexeme, self.line, start_column)
+    def tokenize(self) -> List[Token]:
+        # Scan the rest of the input in one pass; the list always ends with an EOF token.
+        # Positions are not tracked while scanning: each token's line and column are
+        # looked up from the newline offsets, which are found once up front
+        text = self.input
+        base, line, column = self.position, self.line, self.column
+        newlines = []
+        offset = text.find('\n', base)
+        while offset != -1:
+            newlines.append(offset)
+            offset = text.find('\n', offset + 1)
+        
+        tokens: List[Token] = []
+        # Bound methods hoisted out of the loop
+        append = tokens.append
+        classify = self._classify
+        for match in _TOKEN_PATTERN.finditer(text, base):
+            kind = match.lastgroup
+            if kind != 'trivia':
+                start, end = match.span()
+                token_type, lexeme = classify(kind, start, end)
+                # A token's line is the one it ends on (strings may span lines), its column where it starts
+                before = bisect_left(newlines, start)
+                token_line = line + bisect_left(newlines, end, before)
+                token_column = start - newlines[before - 1] if before else column + start - base
+                append(Token(token_type, lexeme, token_line, token_column))
+        
+        self._consume(len(text))
+        append(Token(TokenType.EOF, "", self.line, self.column))
+        return tokens
+
+_OPERATOR_TOKENS = {
+    '=': TokenType.EQUALS,
+    '>': TokenType.GREATER,
+    '<': TokenType.LESS,
+    '>=': TokenType.GREATER_EQUALS,
+    '<=': TokenType.LESS_EQUALS,
+    '!=': TokenType.NOT_EQUALS,
+    '+': TokenType.PLUS,
+    '-': TokenType.MINUS,
+    '*': TokenType.ASTERISK,
+    '/': TokenType.DIVIDE,
+    ',': TokenType.COMMA,
+    ';': TokenType.SEMICOLON,
+    '(': TokenType.LEFT_PAREN,
+    ')': TokenType.RIGHT_PAREN,
+    '.': TokenType.DOT
+}
+
+# One alternation per token class; the regex engine picks the class, so no per-character Python loop.
+# Trivia is any run of whitespace and '#' or '--' line comments, skipped as one match.
+# A number has at most one decimal point ("1.2.3" scans as 1.2, ., 3) and strings may span lines.
+_TOKEN_PATTERN = re.compile(r"""
+    (?P<trivia>(?:\s+|\#[^\n]*|--[^\n]*)+)
+  | (?P<identifier>[^\W\d]\w*)
+  | (?P<number>\d+(?:\.\d*)?)
+  | (?P<string>'[^']*'|"[^"]*")
+  | (?P<unterminated>['"][\s\S]*)
+  | (?P<operator>[<>!]=|[=<>+\-*/,;().])
+  | (?P<error>[\s\S])
+""", re.VERBOSE)
+
+# Binding power of the binary operators, loosest first. Operators up to comparisons
+# build CONDITION nodes, arithmetic builds EXPRESSION nodes
+_OR_PRECEDENCE = 1
+_AND_PRECEDENCE = 2
+_COMPARISON_PRECEDENCE = 3
+_ADDITIVE_PRECEDENCE = 4
+_MULTIPLICATIVE_PRECEDENCE = 5
+_BINARY_PRECEDENCE = {
+    TokenType.OR: _OR_PRECEDENCE,
+    TokenType.AND: _AND_PRECEDENCE,
+    TokenType.EQUALS: _COMPARISON_PRECEDENCE,
+    TokenType.NOT_EQUALS: _COMPARISON_PRECEDENCE,
+    TokenType.GREATER: _COMPARISON_PRECEDENCE,
+    TokenType.LESS: _COMPARISON_PRECEDENCE,
+    TokenType.GREATER_EQUALS: _COMPARISON_PRECEDENCE,
+    TokenType.LESS_EQUALS: _COMPARISON_PRECEDENCE,
+    TokenType.PLUS: _ADDITIVE_PRECEDENCE,
+    TokenType.MINUS: _ADDITIVE_PRECEDENCE,
+    TokenType.ASTERISK: _MULTIPLICATIVE_PRECEDENCE,
+    TokenType.DIVIDE: _MULTIPLICATIVE_PRECEDENCE
+}
 
 # Parser class
 class Parser:
-    def __init__(self, lexer: Lexer):
+    def __init__(self, lexer: Optional[Lexer] = None, tokens: Optional[List[Token]] = None):
+        self.reset(lexer, tokens)
+    
+    def reset(self, lexer: Optional[Lexer] = None, tokens: Optional[List[Token]] = None) -> None:
+        # The whole statement is tokenized up front (or passed in already tokenized,
+        # ending with EOF); the parser walks the list by index. Called again to
+        # reuse the parser for the next statement
+        if tokens is None:
+            if lexer is None:
+                raise TypeError("Parser needs a lexer or a token list")
+            tokens = lexer.tokenize()
         self.lexer = lexer
-        self.current_token = self.lexer.get_next_token()
+        self.tokens = tokens
+        self.position = 0
+        self.current_token = self.tokens[0]
     
     def consume(self, expected_type: TokenType) -> Token:
-        if self.current_token.type == expected_type:
-            token = self.current_token
-            self.current_token = self.lexer.get_next_token()
+        token = self.current_token
+        if token.type is expected_type:
+            # The trailing EOF token is never consumed past
+            if token.type != TokenType.EOF:
+                self.position += 1
+                self.current_token = self.tokens[self.position]
             return token
         else:
             raise SyntaxError(f"Expected {expected_type}, got {self.current_token.type} at line {self.current_token.line}, column {self.current_token.column}")
     
     def parse(self) -> ASTNode:
-        return self.sql_statement()
+        # Exactly one statement, optionally followed by a semicolon
+        statement = self.sql_statement()
+        if self.current_token.type == TokenType.SEMICOLON:
+            self.consume(TokenType.SEMICOLON)
+        self.expect_statement_end()
+        return statement
+    
+    def parse_statements(self) -> List[ASTNode]:
+        # A script of statements separated by semicolons
+        statements: List[ASTNode] = []
+        while True:
+            while self.current_token.type == TokenType.SEMICOLON:
+                self.consume(TokenType.SEMICOLON)
+            if self.current_token.type == TokenType.EOF:
+                return statements
+            statements.append(self.sql_statement())
+            if self.current_token.type != TokenType.SEMICOLON:
+                self.expect_statement_end()
+    
+    def expect_statement_end(self) -> None:
+        token = self.current_token
+        if token.type != TokenType.EOF:
+            raise SyntaxError(f"Unexpected token {token.type} after statement at line {token.line}, column {token.column}")
     
     def sql_statement(self) -> ASTNode:
-        if self.current_token.type == TokenType.SELECT:
-            return self.select_statement()
-        elif self.current_token.type == TokenType.INSERT:
-            return self.insert_statement()
-        elif self.current_token.type == TokenType.UPDATE:
-            return self.update_statement()
-        elif self.current_token.type == TokenType.DELETE:
-            return self.delete_statement()
-        elif self.current_token.type == TokenType.CREATE:
-            return self.create_statement()
-        elif self.current_token.type == TokenType.DROP:
-            return self.drop_statement()
-        else:
+        statement_parser = _STATEMENT_PARSERS.get(self.current_token.type)
+        if statement_parser is None:
             raise SyntaxError(f"Unexpected token {self.current_token.type} at line {self.current_token.line}, column {self.current_token.column}")
+        return statement_parser(self)
     
     def select_statement(self) -> ASTNode:
         node = ASTNode(NodeType.SELECT_STMT)
         
         self.consume(TokenType.SELECT)
-        node.data['columns'] = self.column_list()
+        node.columns = self.column_list()
         
         self.consume(TokenType.FROM)
-        node.data['tables'] = self.table_list()
+        node.tables = self.table_list()
         
         # Optional JOIN clause
-        node.data['joins'] = []
+        node.joins = []
         while self.current_token.type == TokenType.JOIN:
-            node.data['joins'].append(self.join_clause())
+            node.joins.append(self.join_clause())
         
         # Optional WHERE clause
         if self.current_token.type == TokenType.WHERE:
             self.consume(TokenType.WHERE)
-            node.data['where_clause'] = self.condition()
+            node.where_clause = self.condition()
         else:
-            node.data['where_clause'] = None
+            node.where_clause = None
         
         return node
     
@@ -343,7 +404,7 @@ class Parser:
         if self.current_token.type == TokenType.ASTERISK:
             # SELECT *
             asterisk_node = ASTNode(NodeType.IDENTIFIER)
-            asterisk_node.data['name'] = "*"
+            asterisk_node.name = "*"
             columns.append(asterisk_node)
             self.consume(TokenType.ASTERISK)
         else:
@@ -372,7 +433,7 @@ class Parser:
         node = ASTNode(NodeType.TABLE_REF)
         
         if self.current_token.type == TokenType.IDENTIFIER:
-            node.data['name'] = self.current_token.lexeme
+            node.name = self.current_token.lexeme
             self.consume(TokenType.IDENTIFIER)
         else:
             raise SyntaxError(f"Expected table name, got {self.current_token.type} at line {self.current_token.line}, column {self.current_token.column}")
@@ -383,51 +444,45 @@ class Parser:
         node = ASTNode(NodeType.JOIN)
         
         self.consume(TokenType.JOIN)
-        node.data['table'] = self.table_reference()
+        node.table = self.table_reference()
         
         self.consume(TokenType.ON)
-        node.data['condition'] = self.condition()
+        node.condition = self.condition()
         
         return node
     
     def condition(self) -> ASTNode:
-        node = self.expression()
-        
-        if self.current_token.type in [TokenType.EQUALS, TokenType.NOT_EQUALS, 
-                                      TokenType.GREATER, TokenType.LESS, 
-                                      TokenType.GREATER_EQUALS, TokenType.LESS_EQUALS]:
-            operator_type = self.current_token.type
-            self.consume(operator_type)
-            
-            right = self.expression()
-            
-            condition_node = ASTNode(NodeType.CONDITION)
-            condition_node.data['left'] = node
-            condition_node.data['operator'] = operator_type
-            condition_node.data['right'] = right
-            
-            node = condition_node
-        
-        # Check for AND/OR
-        while self.current_token.type in [TokenType.AND, TokenType.OR]:
+        return self.binary_expression(_OR_PRECEDENCE)
+    
+    def expression(self) -> ASTNode:
+        # Value expressions: arithmetic only, no comparisons or AND/OR
+        return self.binary_expression(_ADDITIVE_PRECEDENCE)
+    
+    def binary_expression(self, min_precedence: int) -> ASTNode:
+        # Precedence climbing: loop over operators binding at least as tightly as
+        # min_precedence, parsing each right operand one level tighter (left-associative)
+        node = self.primary()
+        precedence = _BINARY_PRECEDENCE.get(self.current_token.type, 0)
+        while precedence >= min_precedence:
             operator_type = self.current_token.type
             self.consume(operator_type)
             
-            right = self.condition()
+            right = self.binary_expression(precedence + 1)
             
-            condition_node = ASTNode(NodeType.CONDITION)
-            condition_node.data['left'] = node
-            condition_node.data['operator'] = operator_type
-            condition_node.data['right'] = right
+            binary_node = ASTNode(NodeType.CONDITION if precedence <= _COMPARISON_PRECEDENCE else NodeType.EXPRESSION)
+            binary_node.left = node
+            binary_node.operator = operator_type
+            binary_node.right = right
             
-            node = condition_node
+            node = binary_node
+            precedence = _BINARY_PRECEDENCE.get(self.current_token.type, 0)
         
         return node
     
-    def expression(self) -> ASTNode:
+    def primary(self) -> ASTNode:
         if self.current_token.type == TokenType.IDENTIFIER:
             node = ASTNode(NodeType.IDENTIFIER)
-            node.data['name'] = self.current_token.lexeme
+            node.name = self.current_token.lexeme
             self.consume(TokenType.IDENTIFIER)
             
             # Check for table.column notation
@@ -436,24 +491,35 @@ class Parser:
                 
                 if self.current_token.type == TokenType.IDENTIFIER:
                     column_node = ASTNode(NodeType.IDENTIFIER)
-                    column_node.data['name'] = self.current_token.lexeme
+                    column_node.name = self.current_token.lexeme
                     self.consume(TokenType.IDENTIFIER)
                     
                     expr_node = ASTNode(NodeType.EXPRESSION)
-                    expr_node.data['left'] = node
-                    expr_node.data['operator'] = TokenType.DOT
-                    expr_node.data['right'] = column_node
+                    expr_node.left = node
+                    expr_node.operator = TokenType.DOT
+                    expr_node.right = column_node
                     
                     node = expr_node
                 else:
                     raise SyntaxError(f"Expected column name after dot, got {self.current_token.type}")
             
+            # Function call, e.g. COUNT(*)
+            elif self.current_token.type == TokenType.LEFT_PAREN:
+                self.consume(TokenType.LEFT_PAREN)
+                
+                call_node = ASTNode(NodeType.FUNCTION_CALL)
+                call_node.name = node.name
+                call_node.args = self.column_list()
+                self.consume(TokenType.RIGHT_PAREN)
+                
+                node = call_node
+            
             return node
         elif self.current_token.type in [TokenType.INTEGER, TokenType.FLOAT_LITERAL, TokenType.STRING, TokenType.NULL]:
             return self.literal()
         elif self.current_token.type == TokenType.LEFT_PAREN:
             self.consume(TokenType.LEFT_PAREN)
-            node = self.expression()
+            node = self.condition()
             self.consume(TokenType.RIGHT_PAREN)
             return node
         else:
@@ -463,20 +529,20 @@ class Parser:
         node = ASTNode(NodeType.LITERAL)
         
         if self.current_token.type == TokenType.INTEGER:
-            node.data['value_type'] = TokenType.INTEGER
-            node.data['value'] = int(self.current_token.lexeme)
+            node.value_type = TokenType.INTEGER
+            node.value = int(self.current_token.lexeme)
             self.consume(TokenType.INTEGER)
         elif self.current_token.type == TokenType.FLOAT_LITERAL:
-            node.data['value_type'] = TokenType.FLOAT_LITERAL
-            node.data['value'] = float(self.current_token.lexeme)
+            node.value_type = TokenType.FLOAT_LITERAL
+            node.value = float(self.current_token.lexeme)
             self.consume(TokenType.FLOAT_LITERAL)
         elif self.current_token.type == TokenType.STRING:
-            node.data['value_type'] = TokenType.STRING
-            node.data['value'] = self.current_token.lexeme
+            node.value_type = TokenType.STRING
+            node.value = self.current_token.lexeme
             self.consume(TokenType.STRING)
         elif self.current_token.type == TokenType.NULL:
-            node.data['value_type'] = TokenType.NULL
-            node.data['value'] = None
+            node.value_type = TokenType.NULL
+            node.value = None
             self.consume(TokenType.NULL)
         else:
             raise SyntaxError(f"Expected literal, got {self.current_token.type}")
@@ -491,8 +557,8 @@ class Parser:
         
         if self.current_token.type == TokenType.IDENTIFIER:
             table_node = ASTNode(NodeType.IDENTIFIER)
-            table_node.data['name'] = self.current_token.lexeme
-            node.data['table'] = table_node
+            table_node.name = self.current_token.lexeme
+            node.table = table_node
             self.consume(TokenType.IDENTIFIER)
         else:
             raise SyntaxError(f"Expected table name, got {self.current_token.type}")
@@ -500,24 +566,34 @@ class Parser:
         # Optional column list
         if self.current_token.type == TokenType.LEFT_PAREN:
             self.consume(TokenType.LEFT_PAREN)
-            node.data['columns'] = self.column_list()
+            node.columns = self.column_list()
             self.consume(TokenType.RIGHT_PAREN)
         else:
-            node.data['columns'] = []
+            node.columns = []
         
         self.consume(TokenType.VALUES)
+        
+        # One or more parenthesized rows: VALUES (...), (...), ...
+        node.rows = [self.value_list()]
+        
+        while self.current_token.type == TokenType.COMMA:
+            self.consume(TokenType.COMMA)
+            node.rows.append(self.value_list())
+        
+        return node
+    
+    def value_list(self) -> List[ASTNode]:
         self.consume(TokenType.LEFT_PAREN)
         
-        node.data['values'] = []
-        node.data['values'].append(self.expression())
+        values = [self.expression()]
         
         while self.current_token.type == TokenType.COMMA:
             self.consume(TokenType.COMMA)
-            node.data['values'].append(self.expression())
+            values.append(self.expression())
         
         self.consume(TokenType.RIGHT_PAREN)
         
-        return node
+        return values
     
     def update_statement(self) -> ASTNode:
         node = ASTNode(NodeType.UPDATE_STMT)
@@ -526,32 +602,32 @@ class Parser:
         
         if self.current_token.type == TokenType.IDENTIFIER:
             table_node = ASTNode(NodeType.IDENTIFIER)
-            table_node.data['name'] = self.current_token.lexeme
-            node.data['table'] = table_node
+            table_node.name = self.current_token.lexeme
+            node.table = table_node
             self.consume(TokenType.IDENTIFIER)
         else:
             raise SyntaxError(f"Expected table name, got {self.current_token.type}")
         
         self.consume(TokenType.SET)
         
-        node.data['set_clauses'] = []
+        node.set_clauses = []
         
         # First set clause
         set_clause = ASTNode(NodeType.EXPRESSION)
         
         if self.current_token.type == TokenType.IDENTIFIER:
             column_node = ASTNode(NodeType.IDENTIFIER)
-            column_node.data['name'] = self.current_token.lexeme
-            set_clause.data['left'] = column_node
+            column_node.name = self.current_token.lexeme
+            set_clause.left = column_node
             self.consume(TokenType.IDENTIFIER)
         else:
             raise SyntaxError(f"Expected column name, got {self.current_token.type}")
         
         self.consume(TokenType.EQUALS)
-        set_clause.data['operator'] = TokenType.EQUALS
-        set_clause.data['right'] = self.expression()
+        set_clause.operator = TokenType.EQUALS
+        set_clause.right = self.expression()
         
-        node.data['set_clauses'].append(set_clause)
+        node.set_clauses.append(set_clause)
         
         # Additional set clauses
         while self.current_token.type == TokenType.COMMA:
@@ -561,24 +637,24 @@ class Parser:
             
             if self.current_token.type == TokenType.IDENTIFIER:
                 column_node = ASTNode(NodeType.IDENTIFIER)
-                column_node.data['name'] = self.current_token.lexeme
-                set_clause.data['left'] = column_node
+                column_node.name = self.current_token.lexeme
+                set_clause.left = column_node
                 self.consume(TokenType.IDENTIFIER)
             else:
                 raise SyntaxError(f"Expected column name, got {self.current_token.type}")
             
             self.consume(TokenType.EQUALS)
-            set_clause.data['operator'] = TokenType.EQUALS
-            set_clause.data['right'] = self.expression()
+            set_clause.operator = TokenType.EQUALS
+            set_clause.right = self.expression()
             
-            node.data['set_clauses'].append(set_clause)
+            node.set_clauses.append(set_clause)
         
         # Optional WHERE clause
         if self.current_token.type == TokenType.WHERE:
             self.consume(TokenType.WHERE)
-            node.data['where_clause'] = self.condition()
+            node.where_clause = self.condition()
         else:
-            node.data['where_clause'] = None
+            node.where_clause = None
         
         return node
     
@@ -590,8 +666,8 @@ class Parser:
         
         if self.current_token.type == TokenType.IDENTIFIER:
             table_node = ASTNode(NodeType.IDENTIFIER)
-            table_node.data['name'] = self.current_token.lexeme
-            node.data['table'] = table_node
+            table_node.name = self.current_token.lexeme
+            node.table = table_node
             self.consume(TokenType.IDENTIFIER)
         else:
             raise SyntaxError(f"Expected table name, got {self.current_token.type}")
@@ -599,9 +675,9 @@ class Parser:
         # Optional WHERE clause
         if self.current_token.type == TokenType.WHERE:
             self.consume(TokenType.WHERE)
-            node.data['where_clause'] = self.condition()
+            node.where_clause = self.condition()
         else:
-            node.data['where_clause'] = None
+            node.where_clause = None
         
         return node
     
@@ -613,23 +689,23 @@ class Parser:
         
         if self.current_token.type == TokenType.IDENTIFIER:
             table_node = ASTNode(NodeType.IDENTIFIER)
-            table_node.data['name'] = self.current_token.lexeme
-            node.data['table'] = table_node
+            table_node.name = self.current_token.lexeme
+            node.table = table_node
             self.consume(TokenType.IDENTIFIER)
         else:
             raise SyntaxError(f"Expected table name, got {self.current_token.type}")
         
         self.consume(TokenType.LEFT_PAREN)
         
-        node.data['columns'] = []
+        node.columns = []
         
         # First column definition
-        node.data['columns'].append(self.column_definition())
+        node.columns.append(self.column_definition())
         
         # Additional column definitions
         while self.current_token.type == TokenType.COMMA:
             self.consume(TokenType.COMMA)
-            node.data['columns'].append(self.column_definition())
+            node.columns.append(self.column_definition())
         
         self.consume(TokenType.RIGHT_PAREN)
         
@@ -640,14 +716,14 @@ class Parser:
         
         if self.current_token.type == TokenType.IDENTIFIER:
             name_node = ASTNode(NodeType.IDENTIFIER)
-            name_node.data['name'] = self.current_token.lexeme
-            node.data['name'] = name_node
+            name_node.name = self.current_token.lexeme
+            node.name = name_node
             self.consume(TokenType.IDENTIFIER)
         else:
             raise SyntaxError(f"Expected column name, got {self.current_token.type}")
         
         if self.current_token.type in [TokenType.INT, TokenType.TEXT, TokenType.FLOAT, TokenType.DATE]:
-            node.data['data_type'] = self.current_token.type
+            node.data_type = self.current_token.type
             self.consume(self.current_token.type)
         else:
             raise SyntaxError(f"Expected data type, got {self.current_token.type}")
@@ -664,227 +740,285 @@ class Parser:
         
         if self.current_token.type == TokenType.IDENTIFIER:
             table_node = ASTNode(NodeType.IDENTIFIER)
-            table_node.data['name'] = self.current_token.lexeme
-            node.data['table'] = table_node
+            table_node.name = self.current_token.lexeme
+            node.table = table_node
             self.consume(TokenType.IDENTIFIER)
         else:
             raise SyntaxError(f"Expected table name, got {self.current_token.type}")
         
         return node
 
+# Statement parser for each leading keyword
+_STATEMENT_PARSERS = {
+    TokenType.SELECT: Parser.select_statement,
+    TokenType.INSERT: Parser.insert_statement,
+    TokenType.UPDATE: Parser.update_statement,
+    TokenType.DELETE: Parser.delete_statement,
+    TokenType.CREATE: Parser.create_statement,
+    TokenType.DROP: Parser.drop_statement
+}
+
+# SQL text of every keyword and operator token, for the generator
+_TOKEN_STRINGS = {token_type: keyword.upper() for keyword, token_type in _KEYWORDS.items()}
+_TOKEN_STRINGS.update({token_type: lexeme for lexeme, token_type in _OPERATOR_TOKENS.items()})
+
+# Statement keyword and INSERT table name patterns for SQLGenerator.execute
+_EXECUTE_HEAD = re.compile(r'\s*(select|insert|update|delete)\b', re.IGNORECASE)
+_EXECUTE_INSERT_TABLE = re.compile(r'\s*insert\s+into\s+(\w+)', re.IGNORECASE)
+
+# Parsed single statement by query text. The returned AST is shared between callers
+# and must not be modified
+@lru_cache(maxsize=1024)
+def parse_query(query: str) -> ASTNode:
+    return Parser(tokens=Lexer(query).tokenize()).parse()
+
+# Parsed scripts (statements separated by semicolons) by query text, shared like parse_query
+@lru_cache(maxsize=1024)
+def parse_script(query: str) -> Tuple[ASTNode, ...]:
+    return tuple(Parser(tokens=Lexer(query).tokenize()).parse_statements())
+
 # SQL Generator 
 class SQLGenerator:
     def __init__(self, db):
         self.db = db
         self.lexer = None  # Initialize lexer here
-        self.parser = Parser
         
     def execute_without_cursor(self, query: str):
         try:
-          tokens = self.tokenize(query)  # Tokenize the query string
-          ast_list = self.parser.parse(tokens)  # Parse the tokens, returning a list of AST nodes
-
-          results = []  # To store results from each AST execution
-        
-        # Ensure each AST is handled individually
-          for ast in ast_list:
-            if hasattr(ast, 'sql_statement'):  # Check if AST node has 'sql_statement' attribute
-                result = self.db.execute_query(ast)  # Execute query using the DB class
-                results.append(result)
-            else:
-                print(f"AST node does not have 'sql_statement' attribute: {ast}")
-                results.append(False)
-
-        # Return results: if only one result, return it directly, else return all
+            # Lexed and parsed once; repeated queries reuse the cached ASTs.
+            # Every statement in the text runs, in order
+            statements = parse_script(query.strip())
+            if not statements:
+                raise SyntaxError("No statement to execute")
+            results = [self.db.execute_query(ast) for ast in statements]
+            # Return results: if only one result, return it directly, else return all
             return results if len(results) > 1 else results[0]
-    
         except Exception as e:
-           print(f"Execution error: {e}")
-           return False
+            print(f"Execution error: {e}")
+            return False
+
+    def prepare(self, query: str) -> Optional[Callable[[], Any]]:
+        # Parse and plan a statement once; the returned callable executes it.
+        # None if it cannot be planned (the error has been printed)
+        return self.db.prepare(parse_query(query.strip()))
+
+    def prepare_many(self, queries: List[str]) -> List['PreparedStatement']:
+        # Parse every statement up front; see PreparedStatement
+        statements = []
+        for query in queries:
+            try:
+                statements.append(PreparedStatement(self.db, query, parse_query(query.strip())))
+            except SyntaxError as e:
+                statements.append(PreparedStatement(self.db, query, error=e))
+        return statements
+
+    def execute_many(self, statements: List['PreparedStatement']) -> List[Any]:
+        # Run prepared statements in order. A statement that raises is reported and
+        # counts as failed, and the rest of the batch still runs
+        results = []
+        for statement in statements:
+            print(f"\nExecuting: {statement.sql}")
+            try:
+                results.append(statement())
+            except Exception as e:
+                print(f"Error: {str(e)}")
+                results.append(False)
+        return results
 
     def tokenize(self, query: str):
-        # Initialize the lexer to tokenize the query string
-        self.lexer = Lexer(query)  # Create a new lexer instance
-        token = self.lexer.get_next_token()
-        tokens = []
-        while token.type != TokenType.EOF:
-            tokens.append(token)
-            token = self.lexer.get_next_token()
-        return tokens  # Return the list of tokens
+        # Initialize the lexer to tokenize the query string, reusing this generator's lexer
+        if self.lexer is None:
+            self.lexer = Lexer(query)
+        else:
+            self.lexer.reset(query)
+        return self.lexer.tokenize()[:-1]  # Return the list of tokens, without EOF
 
     def generate_sql(self, ast: ASTNode) -> str:
-        if ast.type == NodeType.SELECT_STMT:
-            return self.generate_select(ast)
-        elif ast.type == NodeType.INSERT_STMT:
-            return self.generate_insert(ast)
-        elif ast.type == NodeType.UPDATE_STMT:
-            return self.generate_update(ast)
-        elif ast.type == NodeType.DELETE_STMT:
-            return self.generate_delete(ast)
-        elif ast.type == NodeType.CREATE_STMT:
-            return self.generate_create(ast)
-        elif ast.type == NodeType.DROP_STMT:
-            return self.generate_drop(ast)
-        else:
+        if ast.sql is not None:
+            return ast.sql
+        statement_generator = _STATEMENT_GENERATORS.get(ast.type)
+        if statement_generator is None:
             raise ValueError(f"Unsupported AST node type: {ast.type}")
+        sql = statement_generator(self, ast)
+        ast.sql = sql
+        return sql
 
     def generate_select(self, ast: ASTNode) -> str:
-        sql = "SELECT "
-        sql += self.generate_column_list(ast.data['columns'])
-        sql += " FROM "
-        sql += self.generate_table_list(ast.data['tables'])
+        parts = ["SELECT "]
+        self.emit_column_list(ast.columns, parts)
+        parts.append(" FROM ")
+        parts.append(self.generate_table_list(ast.tables))
         
-        if ast.data['joins']:
-            for join in ast.data['joins']:
-                sql += " " + self.generate_join(join)
+        if ast.joins:
+            for join in ast.joins:
+                parts.append(" ")
+                parts.append(self.generate_join(join))
         
-        if ast.data['where_clause']:
-            sql += " WHERE "
-            sql += self.generate_condition(ast.data['where_clause'])
+        if ast.where_clause:
+            parts.append(" WHERE ")
+            self.emit_expression(ast.where_clause, parts)
         
-        return sql
+        return "".join(parts)
 
     def generate_column_list(self, columns: List[ASTNode]) -> str:
+        parts: List[str] = []
+        self.emit_column_list(columns, parts)
+        return "".join(parts)
+    
+    def emit_column_list(self, columns: List[ASTNode], parts: List[str]) -> None:
         if not columns:
-            return "*"
-        
-        column_strs = []
-        for column in columns:
-            column_strs.append(self.generate_expression(column))
+            parts.append("*")
+            return
         
-        return ", ".join(column_strs)
+        for i, column in enumerate(columns):
+            if i:
+                parts.append(", ")
+            self.emit_expression(column, parts)
     
     def generate_table_list(self, tables: List[ASTNode]) -> str:
-        table_strs = []
-        for table in tables:
-            table_strs.append(self.generate_table_reference(table))
-        
-        return ", ".join(table_strs)
+        return ", ".join(self.generate_table_reference(table) for table in tables)
     
     def generate_table_reference(self, table: ASTNode) -> str:
-        return table.data['name']
+        return table.name
     
     def generate_join(self, join: ASTNode) -> str:
-        sql = "JOIN "
-        sql += self.generate_table_reference(join.data['table'])
-        sql += " ON "
-        sql += self.generate_condition(join.data['condition'])
-        return sql
+        parts = ["JOIN ", self.generate_table_reference(join.table), " ON "]
+        self.emit_expression(join.condition, parts)
+        return "".join(parts)
     
     def generate_condition(self, condition: ASTNode) -> str:
-        if condition.type == NodeType.CONDITION:
-            left = self.generate_expression(condition.data['left'])
-            if 'operator' in condition.data and 'right' in condition.data:
-                operator = self.token_type_to_string(condition.data['operator'])
-                right = self.generate_expression(condition.data['right'])
-                return f"{left} {operator} {right}"
-            else:
-                return left
-        else:
-            return self.generate_expression(condition)
+        return self.generate_expression(condition)
     
     def generate_expression(self, expr: ASTNode) -> str:
-        if expr.type == NodeType.IDENTIFIER:
-            return expr.data['name']
-        elif expr.type == NodeType.LITERAL:
-            return self.generate_literal(expr)
-        elif expr.type == NodeType.EXPRESSION:
-            left = self.generate_expression(expr.data['left'])
-            operator = self.token_type_to_string(expr.data['operator'])
-            right = self.generate_expression(expr.data['right'])
-            return f"{left} {operator} {right}"
-        else:
-            raise ValueError(f"Unsupported expression node type: {expr.type}")
+        parts: List[str] = []
+        self.emit_expression(expr, parts)
+        return "".join(parts)
+    
+    def emit_expression(self, expr: ASTNode, parts: List[str]) -> None:
+        # Walk the expression with an explicit stack of nodes still to expand and
+        # strings to emit as is, pushing each node's pieces in reverse order
+        stack: List[Union[ASTNode, str]] = [expr]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                parts.append(item)
+            elif item.type == NodeType.IDENTIFIER:
+                parts.append(item.name)
+            elif item.type == NodeType.LITERAL:
+                parts.append(self.generate_literal(item))
+            elif item.type == NodeType.CONDITION or item.type == NodeType.EXPRESSION:
+                if item.operator is None or item.right is None:
+                    stack.append(item.left)
+                    continue
+                precedence = _BINARY_PRECEDENCE.get(item.operator)
+                self.push_operand(item.right, precedence, True, stack)
+                stack.append(f" {self.token_type_to_string(item.operator)} ")
+                self.push_operand(item.left, precedence, False, stack)
+            elif item.type == NodeType.FUNCTION_CALL:
+                stack.append(")")
+                for i in range(len(item.args) - 1, -1, -1):
+                    stack.append(item.args[i])
+                    if i:
+                        stack.append(", ")
+                stack.append(f"{item.name}(")
+            else:
+                raise ValueError(f"Unsupported expression node type: {item.type}")
+    
+    def push_operand(self, operand: ASTNode, precedence: Optional[int], is_right: bool, stack: List[Union[ASTNode, str]]) -> None:
+        # Parenthesize a binary operand that binds more loosely than its parent
+        # (or as loosely, on the right, since operators are left-associative)
+        if precedence is not None and operand.type in (NodeType.CONDITION, NodeType.EXPRESSION):
+            operand_precedence = _BINARY_PRECEDENCE.get(operand.operator)
+            if operand_precedence is not None and (operand_precedence < precedence or (is_right and operand_precedence == precedence)):
+                stack.extend((")", operand, "("))
+                return
+        stack.append(operand)
     
     def generate_literal(self, literal: ASTNode) -> str:
-        if literal.data['value_type'] == TokenType.INTEGER:
-            return str(literal.data['value'])
-        elif literal.data['value_type'] == TokenType.FLOAT_LITERAL:
-            return str(literal.data['value'])
-        elif literal.data['value_type'] == TokenType.STRING:
-            return f"'{literal.data['value']}'"
-        elif literal.data['value_type'] == TokenType.NULL:
+        if literal.value_type == TokenType.INTEGER:
+            return str(literal.value)
+        elif literal.value_type == TokenType.FLOAT_LITERAL:
+            return str(literal.value)
+        elif literal.value_type == TokenType.STRING:
+            return f"'{literal.value}'"
+        elif literal.value_type == TokenType.NULL:
             return "NULL"
         else:
-            raise ValueError(f"Unsupported literal type: {literal.data['value_type']}")
+            raise ValueError(f"Unsupported literal type: {literal.value_type}")
     
     def generate_insert(self, ast: ASTNode) -> str:
-        sql = "INSERT INTO "
-        sql += self.generate_table_reference(ast.data['table'])
-        
-        if ast.data['columns']:
-            sql += " (" 
-            sql += self.generate_column_list(ast.data['columns'])
-            sql += ")"
-        
-        sql += " VALUES ("
-        value_strs = []
-        for value in ast.data['values']:
-            value_strs.append(self.generate_expression(value))
-        sql += ", ".join(value_strs)
-        sql += ")"
-        
-        return sql
+        parts = ["INSERT INTO ", self.generate_table_reference(ast.table)]
+        
+        if ast.columns:
+            parts.append(" (")
+            self.emit_column_list(ast.columns, parts)
+            parts.append(")")
+        
+        parts.append(" VALUES ")
+        for i, row in enumerate(ast.rows):
+            parts.append(", (" if i else "(")
+            for j, value in enumerate(row):
+                if j:
+                    parts.append(", ")
+                self.emit_expression(value, parts)
+            parts.append(")")
+        
+        return "".join(parts)
     
     def generate_update(self, ast: ASTNode) -> str:
-        sql = "UPDATE "
-        sql += self.generate_table_reference(ast.data['table'])
-        
-        sql += " SET "
-        set_strs = []
-        for set_clause in ast.data['set_clauses']:
-            left = self.generate_expression(set_clause.data['left'])
-            right = self.generate_expression(set_clause.data['right'])
-            set_strs.append(f"{left} = {right}")
-        sql += ", ".join(set_strs)
-        
-        if ast.data['where_clause']:
-            sql += " WHERE "
-            sql += self.generate_condition(ast.data['where_clause'])
-        
-        return sql
+        parts = ["UPDATE ", self.generate_table_reference(ast.table), " SET "]
+        for i, set_clause in enumerate(ast.set_clauses):
+            if i:
+                parts.append(", ")
+            self.emit_expression(set_clause.left, parts)
+            parts.append(" = ")
+            self.emit_expression(set_clause.right, parts)
+        
+        if ast.where_clause:
+            parts.append(" WHERE ")
+            self.emit_expression(ast.where_clause, parts)
+        
+        return "".join(parts)
     
     def generate_delete(self, ast: ASTNode) -> str:
-        sql = "DELETE FROM "
-        sql += self.generate_table_reference(ast.data['table'])
+        parts = ["DELETE FROM ", self.generate_table_reference(ast.table)]
         
-        if ast.data['where_clause']:
-            sql += " WHERE "
-            sql += self.generate_condition(ast.data['where_clause'])
+        if ast.where_clause:
+            parts.append(" WHERE ")
+            self.emit_expression(ast.where_clause, parts)
         
-        return sql
+        return "".join(parts)
     
     def generate_create(self, ast: ASTNode) -> str:
-        sql = "CREATE TABLE "
-        sql += self.generate_table_reference(ast.data['table'])
-        
-        sql += " ("
-        column_strs = []
-        for column in ast.data['columns']:
-            column_strs.append(self.generate_column_definition(column))
-        sql += ", ".join(column_strs)
-        sql += ")"
-        
-        return sql
+        parts = ["CREATE TABLE ", self.generate_table_reference(ast.table), " ("]
+        for i, column in enumerate(ast.columns):
+            if i:
+                parts.append(", ")
+            parts.append(self.generate_column_definition(column))
+        parts.append(")")
+        
+        return "".join(parts)
     
     def generate_column_definition(self, column: ASTNode) -> str:
-        sql = self.generate_expression(column.data['name'])
-        sql += " " + self.token_type_to_string(column.data['data_type'])
-        return sql
+        return f"{self.generate_expression(column.name)} {self.token_type_to_string(column.data_type)}"
 
     def execute(self, query: str):
         try:
-            if query.strip().lower().startswith("select"):
-                table_name = query.split(' ')[3]
-                table = self.db.get_table(table_name)
-                if not table:
-                    raise ValueError(f"Table '{table_name}' not found.")
-                rows = table.rows
-                columns = [col.name for col in table.columns]
-                return columns, rows
+            # The statement keyword is matched once, without splitting the query
+            head = _EXECUTE_HEAD.match(query)
+            kind = head.group(1).lower() if head else None
+            if kind == "select":
+                # Resolved, filtered and projected by the database, not returned as the whole table
+                result = self.db.select_rows(parse_query(query.strip()))
+                if result is None:
+                    raise ValueError(f"Could not execute query: {query}")
+                return result
 
-            elif query.strip().lower().startswith("insert"):
-                table_name = query.split(' ')[2]
+            elif kind == "insert":
+                match = _EXECUTE_INSERT_TABLE.match(query)
+                if not match:
+                    raise ValueError(f"Could not find the table in: {query}")
+                table_name = match.group(1)
                 table = self.db.get_table(table_name)
                 if not table:
                     raise ValueError(f"Table '{table_name}' not found.")
@@ -892,59 +1026,49 @@ class SQLGenerator:
                 table.add_row(values)
                 return 1
 
-            elif query.strip().lower().startswith("update"):
+            elif kind == "update":
                 return 1
 
-            elif query.strip().lower().startswith("delete"):
+            elif kind == "delete":
                 return 1
 
         except Exception as e:
             raise e
 
     def generate_drop(self, ast: ASTNode) -> str:
-        sql = "DROP TABLE "
-        sql += self.generate_table_reference(ast.data['table'])
-        return sql
+        return "DROP TABLE " + self.generate_table_reference(ast.table)
     
     def token_type_to_string(self, token_type: TokenType) -> str:
-        token_strings = {
-            TokenType.SELECT: "SELECT",
-            TokenType.FROM: "FROM",
-            TokenType.WHERE: "WHERE",
-            TokenType.INSERT: "INSERT",
-            TokenType.INTO: "INTO",
-            TokenType.VALUES: "VALUES",
-            TokenType.UPDATE: "UPDATE",
-            TokenType.SET: "SET",
-            TokenType.DELETE: "DELETE",
-            TokenType.CREATE: "CREATE",
-            TokenType.TABLE: "TABLE",
-            TokenType.DROP: "DROP",
-            TokenType.JOIN: "JOIN",
-            TokenType.ON: "ON",
-            TokenType.AND: "AND",
-            TokenType.OR: "OR",
-            TokenType.NOT: "NOT",
-            TokenType.NULL: "NULL",
-            TokenType.INT: "INT",
-            TokenType.TEXT: "TEXT",
-            TokenType.FLOAT: "FLOAT",
-            TokenType.DATE: "DATE",
-            TokenType.EQUALS: "=",
-            TokenType.GREATER: ">",
-            TokenType.LESS: "<",
-            TokenType.GREATER_EQUALS: ">=",
-            TokenType.LESS_EQUALS: "<=",
-            TokenType.NOT_EQUALS: "!=",
-            TokenType.PLUS: "+",
-            TokenType.MINUS: "-",
-            TokenType.ASTERISK: "*",
-            TokenType.DIVIDE: "/",
-            TokenType.COMMA: ",",
-            TokenType.SEMICOLON: ";",
-            TokenType.LEFT_PAREN: "(",
-            TokenType.RIGHT_PAREN: ")",
-            TokenType.DOT: "."
-        }
-        
-        return token_strings.get(token_type, str(token_type))
+        return _TOKEN_STRINGS.get(token_type, str(token_type))
+
+# One statement of a prepare_many batch. It is planned on its first call, since
+# statements earlier in the batch may create the tables it uses. A statement that
+# failed to parse raises its SyntaxError when called
+class PreparedStatement:
+    __slots__ = ('db', 'sql', 'ast', 'error', 'run')
+
+    def __init__(self, db, sql: str, ast: Optional[ASTNode] = None, error: Optional[SyntaxError] = None):
+        self.db = db
+        self.sql = sql
+        self.ast = ast
+        self.error = error
+        self.run: Optional[Callable[[], Any]] = None
+
+    def __call__(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        if self.run is None:
+            self.run = self.db.prepare(self.ast)
+            if self.run is None:
+                return False
+        return self.run()
+
+# Generator for each statement node type
+_STATEMENT_GENERATORS = {
+    NodeType.SELECT_STMT: SQLGenerator.generate_select,
+    NodeType.INSERT_STMT: SQLGenerator.generate_insert,
+    NodeType.UPDATE_STMT: SQLGenerator.generate_update,
+    NodeType.DELETE_STMT: SQLGenerator.generate_delete,
+    NodeType.CREATE_STMT: SQLGenerator.generate_create,
+    NodeType.DROP_STMT: SQLGenerator.generate_drop
+}
@@ -1,5 +1,8 @@
+import numpy as np
+import pytest
 import sql_compiler as sc
 from database import Database
+from predicate import AndPredicate, compile_kernel, compile_predicate, compile_row_function
 
 def test_sql():
     # Create a database
@@ -16,18 +19,36 @@ def test_sql():
         "INSERT INTO users (id, name, age, salary) VALUES (3, 'Bob', 40, 70000.0);",
         "INSERT INTO users (id, name, age, salary) VALUES (4, 'Abhijeet', 40, 70000.0);",
         
+        # Insert several rows at once
+        "INSERT INTO users (id, name, age, salary) VALUES (5, 'Alice', 35, 65000.0), (6, 'Eve', 28, NULL);",
+        
         # Select all users
         "SELECT * FROM users;",
         
         # Select specific columns
         "SELECT name, age FROM users;",
         
+        # Comments between clauses
+        "SELECT name FROM users -- younger users only\n  # hash comments work too\n  WHERE age < 30;",
+        
         # Select with condition
         "SELECT * FROM users WHERE age > 30;",
         
+        # Count with condition
+        "SELECT COUNT(*) FROM users WHERE age > 30;",
+        
+        # Select with grouped conditions and arithmetic
+        "SELECT name, salary FROM users WHERE (age < 30 OR age > 35) AND salary * 12 > 700000.0;",
+        
+        # A statement that fails to parse is reported and the rest still run
+        "SELEC name FROM users;",
+        
         # Update a user
         "UPDATE users SET salary = 55000.0 WHERE id = 1;",
         
+        # Update from the row's own values
+        "UPDATE users SET salary = salary * 2, age = age + 1 WHERE id = 3;",
+        
         # Select after update
         "SELECT * FROM users;",
         
@@ -41,24 +62,155 @@ def test_sql():
         "DROP TABLE users;"
     ]
     
-    # Execute each statement
-    for sql in sql_statements:
-        print(f"\nExecuting: {sql}")
-        try:
-            # Parse the SQL statement
-            lexer = sc.Lexer(sql)
-            parser = sc.Parser(lexer)
-            ast = parser.parse()
-            
-            # Execute the query
-            db.execute_query(ast)
-            
-            # Consume the semicolon if present
-            if parser.current_token.type == sc.TokenType.SEMICOLON:
-                parser.consume(sc.TokenType.SEMICOLON)
-                
-        except Exception as e:
-            print(f"Error: {str(e)}")
+    # Parse every statement up front, then execute them in order
+    compiler = sc.SQLGenerator(db)
+    compiler.execute_many(compiler.prepare_many(sql_statements))
+
+def test_duplicate_column_names_resolve_to_first():
+    db = Database()
+    db.execute_query(sc.parse_query("CREATE TABLE d (a INT, A TEXT);"))
+    db.execute_query(sc.parse_query("INSERT INTO d VALUES (1, 'x');"))
+    assert db.select_rows(sc.parse_query("SELECT a FROM d;")) == (["a"], [[1]])
+
+def test_kernel_large_int_constant():
+    # Ints outside int64 cannot be passed to a numba kernel; the WHERE clause
+    # must fall back to the NumPy mask path and still answer correctly
+    db = Database()
+    db.execute_query(sc.parse_query("CREATE TABLE t (id INT, score FLOAT);"))
+    table = db.get_table("t")
+    table.add_rows([[i, float(i)] for i in range(100000)])
+    
+    for condition, expected in (("id < 99999999999999999999", 100000), ("id > 99999999999999999999", 0)):
+        ast = sc.parse_query(f"SELECT COUNT(*) FROM t WHERE {condition};")
+        predicate = compile_predicate(ast.where_clause, table)
+        assert compile_kernel(predicate, table) is None
+        assert db.select_rows(ast) == (["COUNT(*)"], [[expected]])
+
+def test_kernel_matches_mask():
+    # numba kernels must select exactly the rows the NumPy mask path does,
+    # including NULLs in both int and float columns
+    pytest.importorskip("numba")
+    db = Database()
+    db.execute_query(sc.parse_query("CREATE TABLE t (a INT, b FLOAT);"))
+    table = db.get_table("t")
+    table.add_rows([[None if i % 7 == 0 else i % 50, None if i % 5 == 0 else i / 4] for i in range(1000)])
+    for condition in ("a > 25", "b <= 100.5", "a = 7 OR b < 3.0", "a != 3 AND b > 10.0",
+                      "a + 1.5 >= b", "b * 2 < a AND a < 40", "(a < 10 OR a > 40) AND b != 20.0"):
+        predicate = compile_predicate(sc.parse_query(f"SELECT * FROM t WHERE {condition};").where_clause, table)
+        kernel = compile_kernel(predicate, table)
+        assert kernel is not None, condition
+        assert np.array_equal(kernel.mask(table), predicate.mask(table)), condition
+
+def test_int64_overflow_does_not_depend_on_table_size():
+    # Small tables are filtered row by row with Python ints, larger ones with NumPy
+    # arrays; integer arithmetic past int64 must give the same answer on both
+    cases = (
+        ("id * 4611686018427387904 > 0", 5, 4),
+        ("id * 4611686018427387904 > 0", 40, 39),
+        ("id + 99999999999999999999 > 0", 5, 5),
+        ("id + 99999999999999999999 > 0", 40, 40),
+    )
+    for condition, rows, expected in cases:
+        db = Database()
+        db.execute_query(sc.parse_query("CREATE TABLE t (id INT);"))
+        db.get_table("t").add_rows([[i] for i in range(rows)])
+        ast = sc.parse_query(f"SELECT COUNT(*) FROM t WHERE {condition};")
+        assert db.select_rows(ast) == (["COUNT(*)"], [[expected]])
+
+def _nullable_table(db, rows):
+    # t(a INT, b FLOAT, c TEXT) with a NULL in every column now and then
+    db.execute_query(sc.parse_query("CREATE TABLE t (a INT, b FLOAT, c TEXT);"))
+    table = db.get_table("t")
+    table.add_rows([[None if i % 7 == 0 else i % 50,
+                     None if i % 5 == 0 else i / 4,
+                     None if i % 11 == 0 else f"name{i % 13}"] for i in range(rows)])
+    return table
+
+def test_row_and_mask_paths_agree():
+    # A WHERE clause selects the same rows whether it is evaluated per row, as
+    # generated Python source or as a NumPy mask, and whatever order AND/OR run their children in
+    db = Database()
+    table = _nullable_table(db, 200)
+    rows = list(table.iter_rows())
+    for condition in ("a > 25", "25 < a", "b <= 10.5", "c = 'name3'", "c != 'name3'", "a = NULL",
+                      "a * 2 + 1 > b", "b / (a - 10) > 1.0", "a < 10 OR a > 40 AND c = 'name1'",
+                      "(a < 10 OR a > 40) AND c != 'name1'", "a = 7 OR b < 3.0 OR c = 'name12'",
+                      "a >= 5 AND b < 40.0 AND a != 9"):
+        predicate = compile_predicate(sc.parse_query(f"SELECT * FROM t WHERE {condition};").where_clause, table)
+        row_function = compile_row_function(predicate)
+        expected = [bool(predicate.eval(row)) for row in rows]
+        assert [bool(row_function(row)) for row in rows] == expected, condition
+        assert predicate.mask(table).tolist() == expected, condition
+
+def test_small_and_large_tables_agree():
+    # Tables below the vectorization threshold are filtered row by row
+    for rows in (20, 200):
+        db = Database()
+        table = _nullable_table(db, rows)
+        ast = sc.parse_query("SELECT a FROM t WHERE a > 10 AND c != 'name4';")
+        expected = [[row[0]] for row in table.iter_rows()
+                    if row[0] is not None and row[0] > 10 and row[2] is not None and row[2] != 'name4']
+        # The first runs interpret the predicate, later ones use the generated row function
+        for _ in range(3):
+            assert db.select_rows(ast) == (["a"], expected)
+
+def test_and_pushdown():
+    # Once few rows survive, an AND evaluates its remaining children on those rows only;
+    # the result must match the plain conjunction of every child's mask
+    db = Database()
+    table = _nullable_table(db, 1000)
+    for condition in ("a = 7 AND b > 50.0 AND c != 'name2'", "a = 3 AND b * 2 > a", "a = 99 AND b > 1.0"):
+        predicate = compile_predicate(sc.parse_query(f"SELECT * FROM t WHERE {condition};").where_clause, table)
+        assert isinstance(predicate, AndPredicate)
+        expected = np.logical_and.reduce([child.mask(table) for child in predicate.children])
+        assert np.array_equal(predicate.mask(table), expected), condition
+
+def test_plan_cache_invalidated_by_drop_and_create():
+    db = Database()
+    db.execute_query(sc.parse_query("CREATE TABLE t (a INT, b TEXT);"))
+    db.execute_query(sc.parse_query("INSERT INTO t VALUES (1, 'x');"))
+    select = sc.parse_query("SELECT b FROM t WHERE a = 1;")
+    insert = db.prepare(sc.parse_query("INSERT INTO t (a, b) VALUES (1, 'y');"))
+    assert db.select_rows(select) == (["b"], [["x"]])
+    
+    # Same name, different column order: cached and prepared plans must not reuse the old table
+    db.execute_query(sc.parse_query("DROP TABLE t;"))
+    db.execute_query(sc.parse_query("CREATE TABLE t (b TEXT, a INT);"))
+    assert db.select_rows(select) == (["b"], [])
+    assert insert()
+    assert db.select_rows(select) == (["b"], [["y"]])
+    assert db.select_rows(sc.parse_query("SELECT * FROM t;")) == (["b", "a"], [["y", 1]])
+    
+    db.execute_query(sc.parse_query("DROP TABLE t;"))
+    assert db.select_rows(select) is None
+    assert not insert()
+
+def test_parse_errors_in_scripts_and_batches():
+    assert len(sc.parse_script("SELECT a FROM t; -- first\nSELECT b FROM t WHERE b > 1;;")) == 2
+    for script in ("SELECT a FROM t; SELEC b FROM t;", "SELECT a FROM t WHERE a > 1 b"):
+        with pytest.raises(SyntaxError):
+            sc.parse_script(script)
+    # parse_query takes exactly one statement
+    with pytest.raises(SyntaxError):
+        sc.parse_query("SELECT a FROM t; SELECT b FROM t;")
+    
+    # A statement of a prepared batch that fails to parse fails alone
+    db = Database()
+    compiler = sc.SQLGenerator(db)
+    results = compiler.execute_many(compiler.prepare_many([
+        "CREATE TABLE t (a INT);", "INSERT INTO t VALUES (1)", "INSERT INTO t VALUE (2);", "INSERT INTO t VALUES (3);"]))
+    assert results == [True, True, False, True]
+    assert db.select_rows(sc.parse_query("SELECT a FROM t;")) == (["a"], [[1], [3]])
+
+def test_operator_precedence():
+    # AND binds tighter than OR, comparisons tighter than AND, * tighter than +
+    where = sc.parse_query("SELECT * FROM t WHERE a + b * 2 > 3 OR c = 1 AND d = 2;").where_clause
+    assert where.operator == sc.TokenType.OR
+    assert where.right.operator == sc.TokenType.AND
+    comparison = where.left
+    assert comparison.operator == sc.TokenType.GREATER
+    assert comparison.left.operator == sc.TokenType.PLUS
+    assert comparison.left.right.operator == sc.TokenType.ASTERISK
 
 if __name__ == "__main__":
     test_sql()
@@ -3,37 +3,103 @@ from tkinter import ttk, scrolledtext, filedialog, messagebox
 import sys
 import os
 import json
+import re
+import sqlite3
+from bisect import bisect_right
 from datetime import datetime
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the current directory to the path to import the SQL compiler modules
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 try:
-    from sql_compiler import SQLGenerator
+    from sql_compiler import NodeType, SQLGenerator, parse_script
     from database import Database
 except ImportError as e:
     print(f"Error importing SQL compiler modules: {e}")
     sys.exit(1)
 
+# SQL keywords
+KEYWORDS = [
+    "SELECT", "FROM", "WHERE", "INSERT", "UPDATE", "DELETE", "CREATE", "DROP", "TABLE",
+    "INTO", "VALUES", "SET", "AND", "OR", "NOT", "NULL", "IS", "IN", "LIKE", "BETWEEN",
+    "JOIN", "INNER", "LEFT", "RIGHT", "OUTER", "ON", "GROUP", "BY", "HAVING", "ORDER",
+    "ASC", "DESC", "LIMIT", "OFFSET", "UNION", "ALL", "DISTINCT", "AS", "CASE", "WHEN",
+    "THEN", "ELSE", "END", "IF", "EXISTS"
+]
+
+# Upper- and lower-case spellings, so keywords written either way are found
+# without building an upper-cased copy of the word
+KEYWORD_SET = frozenset(KEYWORDS + [keyword.lower() for keyword in KEYWORDS])
+
+# Syntax highlighting pattern, compiled once; group names are the editor tag names,
+# except words, which are tagged as keywords when found in KEYWORD_SET (one hash
+# lookup per word instead of trying every keyword in the regex).
+# Comments and strings come first so keywords inside them are not tagged. No match
+# spans a newline, so any range of whole lines can be re-highlighted on its own
+HIGHLIGHT_PATTERN = re.compile(r"""
+    (?P<comment>--[^\n]*|\#[^\n]*)
+  | (?P<string>'[^'\n]*'?|"[^"\n]*"?)
+  | (?P<word>[^\W\d]\w*)
+  | (?P<number>\b\d+(?:\.\d*)?\b)
+""", re.VERBOSE)
+
+# Delay after the last key release before the editor is re-highlighted
+HIGHLIGHT_DELAY_MS = 80
+
+# Interval at which the Tk thread checks for a finished query
+QUERY_POLL_MS = 50
+
+# Most queries kept in the history tab
+HISTORY_LIMIT = 500
+
+# Where the query history is kept between sessions
+HISTORY_DB_PATH = os.path.expanduser("~/.sqlcompiler_history.db")
+
+# Result rows added to the results table at a time
+RESULT_BATCH_SIZE = 500
+
 class SQLCompilerUI:
     def __init__(self, root):
         self.root = root
         self.root.title("SQL Compiler")
         self.root.geometry("1000x700")
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
         
         # Initialize database and compiler
         self.db = Database()
         # Don't initialize another SQLCompilerUI instance here
         self.compiler =  SQLGenerator(self.db)
-        
-        # Query history
-        self.history = []
+        # Queries run off the Tk thread; a single worker keeps them in submission order
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.query_future = None
+        # Pending poll_query callback of each submitted query, by future
+        self.poll_jobs = {}
+        
+        # Query history, oldest first, as parallel lists of query text and timestamp.
+        # The history list widget shows the same entries newest first
+        self.history_queries = []
+        self.history_timestamps = []
+        # History is kept across sessions in a SQLite database, see open_history_db
+        self.history_db = None
+        
+        # Rows of the displayed result and how many are in the table so far
+        self.result_rows = []
+        self.result_rows_loaded = 0
+        
+        # Pending syntax highlighting callback, see schedule_highlight
+        self.highlight_job = None
+        # (first, last) editor lines changed since the last highlighting pass
+        self.dirty_lines = None
         
         # Create the UI components
         self.create_menu()
         self.create_ui()
         
+        # Restore the history of earlier sessions
+        self.open_history_db()
+        
         # Set theme colors
         self.set_theme()
         
@@ -54,7 +120,7 @@ class SQLCompilerUI:
         file_menu.add_command(label="Open Query...", command=self.open_query)
         file_menu.add_command(label="Save Query...", command=self.save_query)
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.root.quit)
+        file_menu.add_command(label="Exit", command=self.close)
         menubar.add_cascade(label="File", menu=file_menu)
         
         # Edit menu
@@ -97,6 +163,13 @@ class SQLCompilerUI:
         )
         execute_button.pack(side=tk.LEFT, padx=(0, 5))
         
+        cancel_button = ttk.Button(
+            button_frame, 
+            text="Cancel", 
+            command=self.cancel_query
+        )
+        cancel_button.pack(side=tk.LEFT, padx=(0, 5))
+        
         clear_button = ttk.Button(
             button_frame, 
             text="Clear", 
@@ -142,7 +215,9 @@ class SQLCompilerUI:
         self.query_editor.tag_configure("comment", foreground="#999999", font=("Consolas", 11, "italic"))
         
         # Bind events for syntax highlighting
-        self.query_editor.bind("<KeyRelease>", self.highlight_syntax)
+        self.query_editor.bind("<KeyPress>", self.mark_dirty)
+        self.query_editor.bind("<<Modified>>", self.on_modified)
+        self.query_editor.bind("<KeyRelease>", self.schedule_highlight)
         
         # Results notebook (tabs)
         self.results_notebook = ttk.Notebook(main_frame)
@@ -198,39 +273,71 @@ class SQLCompilerUI:
         )
         status_bar.pack(side=tk.BOTTOM, fill=tk.X)
     
+    def mark_dirty(self, event=None):
+        # Widen the dirty range to the insert line; called before a key press edits
+        # the text and again once it has, so pastes and line joins are both covered
+        line = int(self.query_editor.index(tk.INSERT).split(".")[0])
+        if self.dirty_lines is None:
+            self.dirty_lines = (line, line)
+        else:
+            first, last = self.dirty_lines
+            self.dirty_lines = (min(first, line), max(last, line))
+    
+    def on_modified(self, event=None):
+        self.mark_dirty()
+        # Re-arm the flag so <<Modified>> fires on the next edit too
+        self.query_editor.edit_modified(False)
+    
+    def schedule_highlight(self, event=None):
+        # Restart the delay on every key release so a burst of typing is highlighted once
+        if self.highlight_job is not None:
+            self.root.after_cancel(self.highlight_job)
+        self.highlight_job = self.root.after(HIGHLIGHT_DELAY_MS, self.highlight_dirty_lines)
+    
+    def highlight_dirty_lines(self):
+        self.highlight_job = None
+        if self.dirty_lines is not None:
+            first, last = self.dirty_lines
+            self.dirty_lines = None
+            self.highlight_lines(first, last)
+    
     def highlight_syntax(self, event=None):
+        # Re-highlight the whole editor
+        self.dirty_lines = None
+        last = int(self.query_editor.index("end-1c").split(".")[0])
+        self.highlight_lines(1, last)
+    
+    def highlight_lines(self, first, last):
+        start, end = f"{first}.0", f"{last}.end"
+        
         # Clear all tags
         for tag in ["keyword", "function", "string", "number", "comment"]:
-            self.query_editor.tag_remove(tag, "1.0", tk.END)
-        
-        # SQL keywords
-        keywords = [
-            "SELECT", "FROM", "WHERE", "INSERT", "UPDATE", "DELETE", "CREATE", "DROP", "TABLE",
-            "INTO", "VALUES", "SET", "AND", "OR", "NOT", "NULL", "IS", "IN", "LIKE", "BETWEEN",
-            "JOIN", "INNER", "LEFT", "RIGHT", "OUTER", "ON", "GROUP", "BY", "HAVING", "ORDER",
-            "ASC", "DESC", "LIMIT", "OFFSET", "UNION", "ALL", "DISTINCT", "AS", "CASE", "WHEN",
-            "THEN", "ELSE", "END", "IF", "EXISTS"
-        ]
-        
-        # Get the text content
-        content = self.query_editor.get("1.0", tk.END)
-        
-        # Highlight keywords
-        for keyword in keywords:
-            start_pos = "1.0"
-            while True:
-                start_pos = self.query_editor.search(
-                    r'\y' + keyword + r'\y', 
-                    start_pos, 
-                    tk.END, 
-                    nocase=True, 
-                    regexp=True
-                )
-                if not start_pos:
-                    break
-                end_pos = f"{start_pos}+{len(keyword)}c"
-                self.query_editor.tag_add("keyword", start_pos, end_pos)
-                start_pos = end_pos
+            self.query_editor.tag_remove(tag, start, end)
+        
+        # Get the text content of the lines
+        content = self.query_editor.get(start, end)
+        
+        # Offsets where each line starts, to turn match offsets into "line.column" indices
+        line_starts = [0]
+        newline = content.find("\n")
+        while newline != -1:
+            line_starts.append(newline + 1)
+            newline = content.find("\n", newline + 1)
+        
+        def index(offset):
+            line = bisect_right(line_starts, offset)
+            return f"{first + line - 1}.{offset - line_starts[line - 1]}"
+        
+        # One pass over the lines tags keywords, strings, numbers and comments
+        for match in HIGHLIGHT_PATTERN.finditer(content):
+            tag = match.lastgroup
+            if tag == "word":
+                word = match.group()
+                if word not in KEYWORD_SET and word.upper() not in KEYWORD_SET:
+                    continue
+                tag = "keyword"
+            match_start, match_end = match.span()
+            self.query_editor.tag_add(tag, index(match_start), index(match_end))
     
     def execute_query(self):
         query = self.query_editor.get("1.0", tk.END).strip()
@@ -240,17 +347,44 @@ class SQLCompilerUI:
         
         # Update status
         self.status_var.set("Executing query...")
-        self.root.update_idletasks()
+        
+        # Execute the query on the worker thread
+        self.query_future = self.executor.submit(self.run_query, query)
+        self.poll_jobs[self.query_future] = self.root.after(QUERY_POLL_MS, self.poll_query, self.query_future, query)
+    
+    def run_query(self, query):
+        # Runs on the worker thread. Every statement in the text is executed in order;
+        # the rows of the last SELECT are returned as (columns, rows) for the results table
+        statements = parse_script(query)
+        if not statements:
+            raise SyntaxError("No statement to execute")
+        result = None
+        for ast in statements:
+            if ast.type == NodeType.SELECT_STMT:
+                result = self.db.select_rows(ast)
+                succeeded = result is not None
+            else:
+                succeeded = self.db.execute_query(ast)
+            if not succeeded:
+                raise ValueError(f"Could not execute query: {self.compiler.generate_sql(ast)}")
+        return result
+    
+    def poll_query(self, future, query):
+        # Runs on the Tk thread until the query submitted by execute_query finishes
+        if future.cancelled():
+            del self.poll_jobs[future]
+            return
+        if not future.done():
+            self.poll_jobs[future] = self.root.after(QUERY_POLL_MS, self.poll_query, future, query)
+            return
+        del self.poll_jobs[future]
         
         try:
-            # Execute the query without using a cursor
-            result = self.compiler.execute_without_cursor(query)
+            result = future.result()
             
             # Add to history
             timestamp = datetime.now().strftime("%H:%M:%S")
-            history_item = f"[{timestamp}] {query[:50]}{'...' if len(query) > 50 else ''}"
-            self.history.append({"query": query, "timestamp": timestamp})
-            self.history_list.insert(0, history_item)
+            self.add_to_history(query, timestamp)
             
             # Display results
             self.display_results(result)
@@ -263,6 +397,25 @@ class SQLCompilerUI:
             self.display_error(str(e))
             self.status_var.set(f"Error: {str(e)}")
     
+    def cancel_query(self):
+        # Only a query still waiting for the worker can be cancelled
+        if self.query_future is not None and self.query_future.cancel():
+            self.status_var.set("Query cancelled")
+        elif self.query_future is not None and not self.query_future.done():
+            self.status_var.set("Query is already running and cannot be cancelled")
+    
+    def close(self):
+        # Stop polling before the widgets go away, drop queries still waiting for
+        # the worker and don't wait for a running one
+        for job in self.poll_jobs.values():
+            self.root.after_cancel(job)
+        self.poll_jobs.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.history_db is not None:
+            self.history_db.close()
+            self.history_db = None
+        self.root.destroy()
+    
     def display_results(self, result):
         # Clear previous results
         for widget in self.table_frame.winfo_children():
@@ -284,14 +437,21 @@ class SQLCompilerUI:
                 tree.heading(col, text=col)
                 tree.column(col, width=100)
             
-            # Add data
-            for row in rows:
-                tree.insert("", tk.END, values=row)
-            
             # Add scrollbars
             x_scrollbar = ttk.Scrollbar(self.table_frame, orient=tk.HORIZONTAL, command=tree.xview)
             y_scrollbar = ttk.Scrollbar(self.table_frame, orient=tk.VERTICAL, command=tree.yview)
-            tree.configure(xscrollcommand=x_scrollbar.set, yscrollcommand=y_scrollbar.set)
+            
+            # Add data: the first batch now, the rest as the view is scrolled to the bottom
+            self.result_rows = rows
+            self.result_rows_loaded = 0
+            self.insert_result_rows(tree)
+            
+            def on_yscroll(first, last):
+                y_scrollbar.set(first, last)
+                if float(last) >= 1.0 and self.result_rows_loaded < len(self.result_rows):
+                    self.insert_result_rows(tree)
+            
+            tree.configure(xscrollcommand=x_scrollbar.set, yscrollcommand=on_yscroll)
             
             # Pack everything
             tree.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
@@ -316,6 +476,15 @@ class SQLCompilerUI:
             )
             message_label.pack(expand=True)
             
+        elif result is None:
+            # No SELECT in the query
+            message_label = ttk.Label(
+                self.table_frame, 
+                text="Query executed successfully.",
+                font=("Arial", 11)
+            )
+            message_label.pack(expand=True)
+            
         else:
             # Other result type
             message_label = ttk.Label(
@@ -325,6 +494,15 @@ class SQLCompilerUI:
             )
             message_label.pack(expand=True)
     
+    def insert_result_rows(self, tree):
+        # Insert the next batch of result rows. Row numbers are used as item ids
+        # so Tk does not have to generate one per row
+        start = self.result_rows_loaded
+        end = min(start + RESULT_BATCH_SIZE, len(self.result_rows))
+        for i in range(start, end):
+            tree.insert("", tk.END, iid=str(i), values=self.result_rows[i])
+        self.result_rows_loaded = end
+    
     def display_error(self, error_message):
         # Clear previous results
         for widget in self.table_frame.winfo_children():
@@ -402,17 +580,61 @@ class SQLCompilerUI:
             self.query_editor.delete("1.0", tk.END)
             self.status_var.set("Editor cleared")
     
+    def open_history_db(self):
+        # Open the history database and load its most recent entries. Without it
+        # (e.g. a read-only home directory) history is kept for this session only
+        try:
+            self.history_db = sqlite3.connect(HISTORY_DB_PATH)
+            self.history_db.execute("PRAGMA journal_mode=WAL")
+            self.history_db.execute("PRAGMA synchronous=NORMAL")
+            self.history_db.execute(
+                "CREATE TABLE IF NOT EXISTS history (id INTEGER PRIMARY KEY, query TEXT, timestamp TEXT)"
+            )
+            entries = self.history_db.execute(
+                "SELECT query, timestamp FROM history ORDER BY id DESC LIMIT ?", (HISTORY_LIMIT,)
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"History will not be saved: {e}")
+            self.history_db = None
+            return
+        
+        for query, timestamp in reversed(entries):
+            self.add_to_history(query, timestamp, save=False)
+    
+    def add_to_history(self, query, timestamp, save=True):
+        history_item = f"[{timestamp}] {query[:50]}{'...' if len(query) > 50 else ''}"
+        self.history_queries.append(query)
+        self.history_timestamps.append(timestamp)
+        self.history_list.insert(0, history_item)
+        if len(self.history_queries) > HISTORY_LIMIT:
+            del self.history_queries[0]
+            del self.history_timestamps[0]
+            self.history_list.delete(tk.END)
+        
+        if save and self.history_db is not None:
+            try:
+                with self.history_db:
+                    self.history_db.execute(
+                        "INSERT INTO history (query, timestamp) VALUES (?, ?)", (query, timestamp)
+                    )
+                    # Drop entries that have fallen out of the history tab
+                    self.history_db.execute(
+                        "DELETE FROM history WHERE id <= (SELECT MAX(id) FROM history) - ?", (HISTORY_LIMIT,)
+                    )
+            except sqlite3.Error as e:
+                print(f"Could not save history: {e}")
+    
     def load_from_history(self, event):
         selected_index = self.history_list.curselection()
         if selected_index:
-            # Get the selected history item
-            index = selected_index[0]
-            if index < len(self.history):
+            # Get the selected history item; the list widget is newest first
+            index = len(self.history_queries) - 1 - selected_index[0]
+            if 0 <= index < len(self.history_queries):
                 # Load the query into the editor
                 self.query_editor.delete("1.0", tk.END)
-                self.query_editor.insert(tk.END, self.history[index]["query"])
+                self.query_editor.insert(tk.END, self.history_queries[index])
                 self.highlight_syntax()
-                self.status_var.set(f"Loaded query from history ({self.history[index]['timestamp']})")
+                self.status_var.set(f"Loaded query from history ({self.history_timestamps[index]})")
     
     def show_about(self):
         messagebox.showinfo(